@@ -8,21 +8,127 @@ WHY: Main application orchestrates all components with proper logging,
 error handling, and security measures following Flask best practices.
 """
 
+import atexit
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
-from flask import Flask, request
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import orjson
+from flask import Flask, Response, g, request
+from flask.json.provider import DefaultJSONProvider
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
-# Add current directory to Python path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
+# WHY: Sibling modules resolve through the entry point's directory, which the
+# interpreter (python app.py, run.py) and gunicorn/waitress (wsgi:application)
+# already place first on sys.path; no runtime path mutation needed
 from config import get_config, Config
 from services.whatsapp_service import WhatsAppService, WhatsAppServiceError
+from services.notification_queue import NotificationQueue
 from handlers.webhook_handler import AttendanceWebhookHandler, create_webhook_routes
 
+# Error handler registry: key -> (status code, error label, message, log level)
+_ERROR_RESPONSES = {
+    400: (400, 'Bad Request', 'The request could not be understood by the server', logging.WARNING),
+    404: (404, 'Not Found', 'The requested resource was not found', logging.INFO),
+    405: (405, 'Method Not Allowed', 'The request method is not allowed for this resource', logging.WARNING),
+    413: (413, 'Payload Too Large', 'The request payload is too large', logging.WARNING),
+    429: (429, 'Rate Limit Exceeded', 'Too many requests. Please try again later.', logging.WARNING),
+    500: (500, 'Internal Server Error', 'An unexpected error occurred', logging.ERROR),
+    WhatsAppServiceError: (503, 'Service Unavailable', 'WhatsApp service is currently unavailable', logging.ERROR),
+}
+
+# Application package loggers that follow the configured LOG_LEVEL
+_APP_LOGGER_NAMES = ('services', 'handlers')
+
+# Request paths excluded from request/response logging (health probes)
+_SILENT_PATH_PREFIX = '/health'
+_SILENT_PATH_LEN = len(_SILENT_PATH_PREFIX)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    
+    WHY: orjson encodes and decodes several times faster than the stdlib
+    json module; types it cannot handle fall back to Flask's default hook
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+class ContentLengthLimit:
+    """
+    WSGI middleware that rejects oversized request bodies up front.
+    
+    WHY: Requests whose declared Content-Length exceeds the limit get a 413
+    before Flask reads any of the body; Flask's MAX_CONTENT_LENGTH still
+    guards bodies sent without a Content-Length header
+    """
+    
+    def __init__(self, wsgi_app, max_length: int):
+        self.wsgi_app = wsgi_app
+        self.max_length = max_length
+        _, label, message, _ = _ERROR_RESPONSES[413]
+        self._body = orjson.dumps({'success': False, 'error': label, 'message': message})
+        self._headers = [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(self._body))),
+        ]
+    
+    def __call__(self, environ, start_response):
+        try:
+            content_length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0  # Malformed header: let Werkzeug handle it
+        
+        if content_length > self.max_length:
+            start_response('413 Request Entity Too Large', list(self._headers))
+            return [self._body]
+        
+        return self.wsgi_app(environ, start_response)
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Log formatter with per-second timestamp caching.
+    
+    INFO/DEBUG records use a compact format; WARNING and above also
+    include the originating function and line number.
+    
+    WHY: Request logs are the bulk of all records; caching the strftime
+    result per second and skipping call-site fields for routine records
+    keeps formatting cheap without losing detail where it matters
+    """
+    
+    HOT_FMT = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+    DETAIL_FMT = '%(asctime)s %(levelname)s [%(name)s] [%(funcName)s:%(lineno)d] %(message)s'
+    
+    def __init__(self):
+        super().__init__(self.HOT_FMT)
+        self._detail_style = logging.PercentStyle(self.DETAIL_FMT)
+        self._cached_time = (None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        second = int(record.created)
+        cached_second, cached_text = self._cached_time
+        if second != cached_second:
+            cached_text = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_time = (second, cached_text)
+        return self.default_msec_format % (cached_text, record.msecs)
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        if record.levelno >= logging.WARNING:
+            return self._detail_style.format(record)
+        return self._style.format(record)
+
 
 def create_app(environment: str = None) -> Flask:
     """
@@ -41,10 +147,20 @@ def create_app(environment: str = None) -> Flask:
     # Create Flask app
     app = Flask(__name__)
     
+    # Use orjson for request parsing and response serialization
+    app.json = OrjsonProvider(app)
+    
     # Load configuration
     config = get_config(environment)
     app.config.from_object(config)
     
+    # WHY: Later setup steps read the resolved config from the app instead
+    # of resolving it again
+    app.extensions['app_config'] = config
+    
+    # Reject oversized bodies before they are read
+    app.wsgi_app = ContentLengthLimit(app.wsgi_app, config.MAX_CONTENT_LENGTH)
+    
     # Validate required configuration
     try:
         config.validate_required_config()
@@ -67,42 +183,81 @@ def setup_logging(app: Flask, config: Config) -> None:
     debugging, and security auditing
     """
     
-    # Set logging level
+    # Resolve logging level once
     log_level = getattr(logging, config.LOG_LEVEL.upper(), logging.INFO)
-    app.logger.setLevel(log_level)
-    
-    # Remove default Flask handler
-    if app.logger.handlers:
-        app.logger.handlers.clear()
+    app.config['_LOG_LEVEL_INT'] = log_level
     
     # Create formatter for structured logging
-    formatter = logging.Formatter(
-        '%(asctime)s %(levelname)s [%(name)s] [%(funcName)s:%(lineno)d] %(message)s'
-    )
+    formatter = StructuredFormatter()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    app.logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler with rotation
     if config.LOG_FILE:
         file_handler = RotatingFileHandler(
             config.LOG_FILE,
             maxBytes=10 * 1024 * 1024,  # 10MB
-            backupCount=5
+            backupCount=5,
+            encoding='utf-8'  # WHY: Messages carry emojis and accented names
         )
         file_handler.setLevel(log_level)
         file_handler.setFormatter(formatter)
-        app.logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # WHY: Request threads only enqueue records; the listener thread performs
+    # the blocking stream/file writes and rollover checks off the request path
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    app.extensions['log_listener'] = _start_log_listener(log_queue, handlers)
+    # WHY: Looked up at exit so a listener restarted after fork is the one stopped
+    atexit.register(lambda: app.extensions['log_listener'].stop())
+    
+    # WHY: Under gunicorn --preload this runs in the master and workers are
+    # forked without the listener thread; each child gets a fresh queue and
+    # its own listener so records are not stranded
+    if hasattr(os, 'register_at_fork'):
+        def _restart_log_listener() -> None:
+            child_queue = queue.SimpleQueue()
+            queue_handler.queue = child_queue
+            app.extensions['log_listener'] = _start_log_listener(child_queue, handlers)
+        
+        os.register_at_fork(after_in_child=_restart_log_listener)
     
-    # Set root logger level
-    logging.getLogger().setLevel(log_level)
+    # WHY: Handlers are fully built before being swapped in with a single
+    # slice assignment, replacing Flask's default handler without a window
+    # where records are dropped or emitted twice
+    app.logger.setLevel(log_level)
+    app.logger.handlers[:] = [queue_handler]
+    
+    # WHY: Root handler serves module loggers (services, handlers); app logger
+    # must not propagate or its records would be enqueued twice
+    app.logger.propagate = False
+    root_logger = logging.getLogger()
+    root_logger.handlers[:] = [
+        handler for handler in root_logger.handlers if not isinstance(handler, QueueHandler)
+    ] + [queue_handler]
+    
+    # WHY: Root stays at WARNING so third-party libraries (werkzeug, urllib3,
+    # whatsapp-python) don't flood the handlers; only application packages
+    # log at the configured level
+    root_logger.setLevel(logging.WARNING)
+    for logger_name in _APP_LOGGER_NAMES:
+        logging.getLogger(logger_name).setLevel(log_level)
     
     app.logger.info(f"Logging configured with level: {config.LOG_LEVEL}")
 
 
+def _start_log_listener(log_queue: queue.SimpleQueue, handlers: list) -> QueueListener:
+    """Start a listener thread writing queued log records to the handlers."""
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
 def setup_rate_limiting(app: Flask, config: Config) -> Limiter:
     """
     Configure rate limiting for API endpoints.
@@ -117,16 +272,45 @@ def setup_rate_limiting(app: Flask, config: Config) -> Limiter:
     WHY: Rate limiting prevents abuse and ensures service availability
     """
     
+    default_limits = [config.RATE_LIMIT]
+    if config.RATE_LIMIT_BURST:
+        default_limits.append(config.RATE_LIMIT_BURST)
+    
+    # WHY: Shared storage keeps counters consistent across gunicorn workers
     limiter = Limiter(
         key_func=get_remote_address,
-        default_limits=[config.RATE_LIMIT]
+        default_limits=default_limits,
+        storage_uri=config.RATELIMIT_STORAGE_URL,
+        strategy=config.RATELIMIT_STRATEGY
     )
     limiter.init_app(app)
     
-    app.logger.info(f"Rate limiting configured: {config.RATE_LIMIT}")
+    app.logger.info(
+        "Rate limiting configured: %s (storage: %s, strategy: %s)",
+        '; '.join(default_limits), config.RATELIMIT_STORAGE_URL.split('://', 1)[0],
+        config.RATELIMIT_STRATEGY
+    )
     return limiter
 
 
+def _client_info() -> tuple:
+    """
+    Return (remote address, User-Agent) for the current request.
+    
+    WHY: Resolved from the WSGI environ once per request and memoized on g,
+    so request/response logging and error handlers share one lookup. Lazy
+    rather than set in before_request because errors such as 429 are raised
+    by hooks that run before ours
+    """
+    info = g.get('_client_info')
+    if info is None:
+        info = g._client_info = (
+            request.remote_addr,
+            request.headers.get('User-Agent', 'Unknown')
+        )
+    return info
+
+
 def setup_error_handlers(app: Flask) -> None:
     """
     Configure global error handlers for the application.
@@ -138,68 +322,31 @@ def setup_error_handlers(app: Flask) -> None:
     and proper logging of all application errors
     """
     
-    @app.errorhandler(400)
-    def bad_request(error):
-        app.logger.warning(f"Bad request from {request.remote_addr}: {error}")
-        return {
-            'success': False,
-            'error': 'Bad Request',
-            'message': 'The request could not be understood by the server'
-        }, 400
-    
-    @app.errorhandler(404)
-    def not_found(error):
-        app.logger.info(f"404 request from {request.remote_addr}: {request.url}")
-        return {
-            'success': False,
-            'error': 'Not Found',
-            'message': 'The requested resource was not found'
-        }, 404
-    
-    @app.errorhandler(405)
-    def method_not_allowed(error):
-        app.logger.warning(f"Method not allowed from {request.remote_addr}: {request.method} {request.url}")
-        return {
-            'success': False,
-            'error': 'Method Not Allowed',
-            'message': 'The request method is not allowed for this resource'
-        }, 405
-    
-    @app.errorhandler(413)
-    def payload_too_large(error):
-        app.logger.warning(f"Payload too large from {request.remote_addr}")
-        return {
-            'success': False,
-            'error': 'Payload Too Large',
-            'message': 'The request payload is too large'
-        }, 413
-    
-    @app.errorhandler(429)
-    def rate_limit_exceeded(error):
-        app.logger.warning(f"Rate limit exceeded from {request.remote_addr}")
-        return {
-            'success': False,
-            'error': 'Rate Limit Exceeded',
-            'message': 'Too many requests. Please try again later.'
-        }, 429
-    
-    @app.errorhandler(500)
-    def internal_error(error):
-        app.logger.error(f"Internal server error: {error}")
-        return {
-            'success': False,
-            'error': 'Internal Server Error',
-            'message': 'An unexpected error occurred'
-        }, 500
-    
-    @app.errorhandler(WhatsAppServiceError)
-    def whatsapp_service_error(error):
-        app.logger.error(f"WhatsApp service error: {error}")
-        return {
-            'success': False,
-            'error': 'Service Unavailable',
-            'message': 'WhatsApp service is currently unavailable'
-        }, 503
+    for key, (status_code, label, message, level) in _ERROR_RESPONSES.items():
+        app.register_error_handler(key, _make_error_handler(app, status_code, label, message, level))
+
+
+def _make_error_handler(app: Flask, status_code: int, label: str, message: str, level: int):
+    """
+    Build an error handler returning a prebuilt response body.
+    
+    WHY: All handlers share one shape; the body is serialized once per
+    status code and the log message is only formatted if the level is enabled
+    """
+    body = orjson.dumps({
+        'success': False,
+        'error': label,
+        'message': message
+    })
+    
+    def handle_error(error):
+        app.logger.log(
+            level, "%s from %s: %s %s (%s)",
+            label, _client_info()[0], request.method, request.url, error
+        )
+        return Response(body, status=status_code, mimetype='application/json')
+    
+    return handle_error
 
 
 def setup_request_logging(app: Flask) -> None:
@@ -212,20 +359,26 @@ def setup_request_logging(app: Flask) -> None:
     WHY: Request logging provides audit trail and helps with debugging
     """
     
+    logger = app.logger
+    
+    # WHY: Level check comes first so disabled INFO logging (production)
+    # skips the header lookups and message arguments entirely; health
+    # checks are skipped with a slice comparison instead of startswith()
     @app.before_request
     def log_request_info():
-        if not request.path.startswith('/health'):  # Skip health check logs
-            app.logger.info(
-                f"Request: {request.method} {request.path} from {request.remote_addr} "
-                f"User-Agent: {request.headers.get('User-Agent', 'Unknown')}"
+        if logger.isEnabledFor(logging.INFO) and request.path[:_SILENT_PATH_LEN] != _SILENT_PATH_PREFIX:
+            remote_addr, user_agent = _client_info()
+            logger.info(
+                "Request: %s %s from %s User-Agent: %s",
+                request.method, request.path, remote_addr, user_agent
             )
     
     @app.after_request
     def log_response_info(response):
-        if not request.path.startswith('/health'):  # Skip health check logs
-            app.logger.info(
-                f"Response: {response.status_code} for {request.method} {request.path} "
-                f"to {request.remote_addr}"
+        if logger.isEnabledFor(logging.INFO) and request.path[:_SILENT_PATH_LEN] != _SILENT_PATH_PREFIX:
+            logger.info(
+                "Response: %s for %s %s to %s",
+                response.status_code, request.method, request.path, _client_info()[0]
             )
         return response
 
@@ -248,9 +401,27 @@ def initialize_services(app: Flask, config: Config) -> tuple:
         # Initialize WhatsApp service
         whatsapp_config = config.get_whatsapp_config()
         whatsapp_service = WhatsAppService(whatsapp_config)
+        # WHY: atexit runs handlers in reverse order, so the service closes
+        # only after the queue registered below has drained
+        atexit.register(whatsapp_service.close)
+        
+        # WHY: Deliveries run on background workers so webhooks are
+        # acknowledged without waiting for the WhatsApp API
+        notification_queue = NotificationQueue(
+            whatsapp_service,
+            maxsize=config.NOTIFICATION_QUEUE_SIZE,
+            workers=config.NOTIFICATION_WORKERS,
+            batch_size=config.NOTIFICATION_BATCH_SIZE,
+            flush_ms=config.NOTIFICATION_FLUSH_MS
+        )
+        notification_queue.start()
+        atexit.register(notification_queue.stop)
+        app.extensions['notification_queue'] = notification_queue
         
         # Initialize webhook handler
-        webhook_handler = AttendanceWebhookHandler(whatsapp_service)
+        webhook_handler = AttendanceWebhookHandler(whatsapp_service, notification_queue)
+        app.extensions['whatsapp_service'] = whatsapp_service
+        app.extensions['webhook_handler'] = webhook_handler
         
         app.logger.info("All services initialized successfully")
         return whatsapp_service, webhook_handler
@@ -260,6 +431,79 @@ def initialize_services(app: Flask, config: Config) -> tuple:
         raise
 
 
+def build_app(environment: str = None) -> Flask:
+    """
+    Create a fully configured application with services and routes.
+    
+    Args:
+        environment: Environment name (development/production/testing)
+        
+    Returns:
+        Flask application ready to serve requests
+        
+    WHY: Single assembly path shared by the development server (main)
+    and the WSGI entry point, so both are wired identically
+    """
+    
+    # Create and configure Flask app
+    app = create_app(environment)
+    config = app.extensions['app_config']
+    
+    # Setup logging
+    setup_logging(app, config)
+    
+    # Setup rate limiting
+    setup_rate_limiting(app, config)
+    
+    # Setup error handlers
+    setup_error_handlers(app)
+    
+    # Setup request logging
+    setup_request_logging(app)
+    
+    # Initialize services
+    whatsapp_service, webhook_handler = initialize_services(app, config)
+    
+    # Create webhook routes
+    create_webhook_routes(app, webhook_handler, config.WHATSAPP_VERIFY_TOKEN)
+    
+    return app
+
+
+def warm_up_app(app: Flask) -> None:
+    """
+    Warm an assembled application before it serves requests.
+    
+    Args:
+        app: Application returned by build_app()
+        
+    WHY: CPU-only first-use work runs right away (once in the gunicorn
+    master under --preload, shared by the workers); connections to the
+    Graph API and the rate limit storage belong to a process, so they are
+    opened in a background thread here and again in every forked worker
+    """
+    config = app.extensions['app_config']
+    if not config.WARMUP_ON_START:
+        return
+    
+    app.extensions['webhook_handler'].warm_up()
+    
+    def _warm_up_connections() -> None:
+        app.extensions['whatsapp_service'].warm_up()
+        for limiter in app.extensions.get('limiter', ()):
+            try:
+                limiter.storage.check()
+            except Exception as e:
+                app.logger.warning("Rate limit storage warm-up failed: %s", e)
+    
+    def _start_warm_up() -> None:
+        threading.Thread(target=_warm_up_connections, name='warm-up', daemon=True).start()
+    
+    _start_warm_up()
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_start_warm_up)
+
+
 def main():
     """
     Main application entry point.
@@ -272,38 +516,31 @@ def main():
     environment = os.environ.get('FLASK_ENV', 'development')
     
     try:
-        # Create and configure Flask app
-        app = create_app(environment)
-        config = get_config(environment)
-        
-        # Setup logging
-        setup_logging(app, config)
-        
-        # Setup rate limiting
-        limiter = setup_rate_limiting(app, config)
-        
-        # Setup error handlers
-        setup_error_handlers(app)
-        
-        # Setup request logging
-        setup_request_logging(app)
-        
-        # Initialize services
-        whatsapp_service, webhook_handler = initialize_services(app, config)
-        
-        # Create webhook routes
-        create_webhook_routes(app, webhook_handler, config.WHATSAPP_VERIFY_TOKEN)
+        app = build_app(environment)
+        config = app.extensions['app_config']
         
         app.logger.info(f"Starting Flask application in {environment} mode")
         app.logger.info(f"Server will run on {config.HOST}:{config.PORT}")
         
-        # Run the application
-        app.run(
-            host=config.HOST,
-            port=config.PORT,
-            debug=config.DEBUG,
-            threaded=True
-        )
+        # WHY: Werkzeug's server (with reloader) is only for debugging;
+        # otherwise serve through waitress' connection-handling worker pool
+        if config.DEBUG:
+            app.run(
+                host=config.HOST,
+                port=config.PORT,
+                debug=config.DEBUG,
+                threaded=True
+            )
+        else:
+            from waitress import serve
+            serve(
+                app,
+                host=config.HOST,
+                port=config.PORT,
+                threads=max(8, 2 * (os.cpu_count() or 1)),
+                backlog=1024,
+                channel_timeout=30
+            )
         
     except Exception as e:
         print(f"Failed to start application: {e}")
@@ -8,12 +8,80 @@ WHY: Centralized configuration management ensures consistent settings
 across environments and proper separation of secrets.
 """
 
+from __future__ import annotations
+
 import os
-from typing import Dict, Any, List
+import re
+from functools import lru_cache
+from typing import Dict, Any, Callable, Optional, Tuple
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+__all__ = [
+    'Config',
+    'DevelopmentConfig',
+    'ProductionConfig',
+    'TestingConfig',
+    'get_config',
+    'config_map',
+]
+
+# WHY: .env is loaded on first configuration access rather than at import
+_DOTENV_LOADED = False
+
+# Phone number lines: 11 digits starting with 51, surrounding whitespace allowed
+# WHY: The whitespace set is the one bytes.strip() removes (bar the newline
+# ending the line), so the regex and the per-line fallback agree
+_PHONE_LINE_RE = re.compile(rb'^[ \t\r\f\v]*(51\d{9})[ \t\r\f\v]*$', re.M)
+
+# Lines that carry content (not blank and not a # comment)
+_CONTENT_LINE_RE = re.compile(rb'^[ \t\r\f\v]*[^#\s].*$', re.M)
+
+# ASCII digits, deleted by the translate() check in _is_phone_line
+_DIGITS = b'0123456789'
+
+
+def _load_dotenv_once() -> None:
+    """Load environment variables from .env file (first call only)."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+def _is_phone_line(line: bytes) -> bool:
+    """
+    Check a stripped line is 11 digits starting with 51.
+    
+    WHY: Deleting the ASCII digits with bytes.translate runs the digit
+    check in a single C call; anything left over is not a digit
+    """
+    return (
+        len(line) == 11
+        and line[:2] == b'51'
+        and not line.translate(None, _DIGITS)
+    )
+
+
+class _LazyEnv:
+    """
+    Configuration attribute evaluated from the environment on first read.
+    
+    WHY: Importing this module parses nothing; each setting is computed
+    (and cached) only when accessed, after .env has been loaded. Subclasses
+    can still override a setting with a plain class attribute.
+    """
+    
+    _UNSET = object()
+    
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._value = self._UNSET
+    
+    def __get__(self, instance, owner):
+        if self._value is self._UNSET:
+            _load_dotenv_once()
+            self._value = self._factory()
+        return self._value
 
 
 class Config:
@@ -25,30 +93,87 @@ class Config:
     """
     
     # Flask Configuration
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    SECRET_KEY = _LazyEnv(lambda: os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production')
     
     # WhatsApp API Configuration
-    WHATSAPP_TOKEN = os.environ.get('WHATSAPP_TOKEN')
-    WHATSAPP_PHONE_NUMBER_ID = os.environ.get('WHATSAPP_PHONE_NUMBER_ID')
-    WHATSAPP_VERIFY_TOKEN = os.environ.get('WHATSAPP_VERIFY_TOKEN')
-    WHATSAPP_RECIPIENT_NUMBER = os.environ.get('WHATSAPP_RECIPIENT_NUMBER')  # Fallback for single number
-    PHONE_NUMBERS_FILE = os.environ.get('PHONE_NUMBERS_FILE', 'phone_numbers.txt')
+    WHATSAPP_TOKEN = _LazyEnv(lambda: os.environ.get('WHATSAPP_TOKEN'))
+    WHATSAPP_PHONE_NUMBER_ID = _LazyEnv(lambda: os.environ.get('WHATSAPP_PHONE_NUMBER_ID'))
+    WHATSAPP_VERIFY_TOKEN = _LazyEnv(lambda: os.environ.get('WHATSAPP_VERIFY_TOKEN'))
+    WHATSAPP_RECIPIENT_NUMBER = _LazyEnv(lambda: os.environ.get('WHATSAPP_RECIPIENT_NUMBER'))  # Fallback for single number
+    PHONE_NUMBERS_FILE = _LazyEnv(lambda: os.environ.get('PHONE_NUMBERS_FILE', 'phone_numbers.txt'))
+    
+    # WHY: Pinning the Graph API version (e.g. "v18.0") builds the messages
+    # endpoint directly; unset uses the version detected by whatsapp-python
+    WHATSAPP_API_VERSION = _LazyEnv(lambda: os.environ.get('WHATSAPP_API_VERSION'))
+    
+    # WHY: Recipient sends are I/O-bound and fan out on a thread pool; the
+    # in-flight cap stays below WhatsApp's per-number throughput limit
+    WHATSAPP_SEND_WORKERS = _LazyEnv(lambda: int(os.environ.get('WHATSAPP_SEND_WORKERS', 10)))
+    WHATSAPP_MAX_IN_FLIGHT = _LazyEnv(lambda: int(os.environ.get('WHATSAPP_MAX_IN_FLIGHT', 25)))
+    
+    # WHY: Client-side pacing below the provider's messages-per-second limits
+    # (text and media are limited separately; 0 disables pacing)
+    WHATSAPP_TEXT_RATE = _LazyEnv(lambda: float(os.environ.get('WHATSAPP_TEXT_RATE', 25)))
+    WHATSAPP_MEDIA_RATE = _LazyEnv(lambda: float(os.environ.get('WHATSAPP_MEDIA_RATE', 1.5)))
+    
+    # WHY: After repeated Graph API failures sends fail fast until a probe
+    # after the reset timeout succeeds
+    WHATSAPP_BREAKER_FAILURES = _LazyEnv(lambda: int(os.environ.get('WHATSAPP_BREAKER_FAILURES', 5)))
+    WHATSAPP_BREAKER_RESET_SECONDS = _LazyEnv(lambda: float(os.environ.get('WHATSAPP_BREAKER_RESET_SECONDS', 30.0)))
+    
+    # WHY: Transient Graph API failures (timeouts, 429, 5xx) are retried with
+    # exponential backoff and jitter instead of failing the recipient
+    WHATSAPP_MAX_RETRIES = _LazyEnv(lambda: int(os.environ.get('WHATSAPP_MAX_RETRIES', 3)))
+    WHATSAPP_RETRY_BASE_SECONDS = _LazyEnv(lambda: float(os.environ.get('WHATSAPP_RETRY_BASE_SECONDS', 1.0)))
+    WHATSAPP_RETRY_MAX_SECONDS = _LazyEnv(lambda: float(os.environ.get('WHATSAPP_RETRY_MAX_SECONDS', 30.0)))
+    
+    # WHY: A hung Graph API socket must not hold a send thread forever; set
+    # slightly above the observed p95 connect/response times
+    WHATSAPP_CONNECT_TIMEOUT = _LazyEnv(lambda: float(os.environ.get('WHATSAPP_CONNECT_TIMEOUT', 3.0)))
+    WHATSAPP_READ_TIMEOUT = _LazyEnv(lambda: float(os.environ.get('WHATSAPP_READ_TIMEOUT', 10.0)))
     
     # Application Configuration
-    HOST = os.environ.get('HOST', '127.0.0.1')
-    PORT = int(os.environ.get('PORT', 7000))
-    DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() in ('true', '1', 'yes')
+    HOST = _LazyEnv(lambda: os.environ.get('HOST', '127.0.0.1'))
+    PORT = _LazyEnv(lambda: int(os.environ.get('PORT', 7000)))
+    DEBUG = _LazyEnv(lambda: os.environ.get('FLASK_DEBUG', 'False').lower() in ('true', '1', 'yes'))
     
     # Logging Configuration
-    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
-    LOG_FILE = os.environ.get('LOG_FILE', 'attendance_notifier.log')
+    LOG_LEVEL = _LazyEnv(lambda: os.environ.get('LOG_LEVEL', 'INFO'))
+    LOG_FILE = _LazyEnv(lambda: os.environ.get('LOG_FILE', 'attendance_notifier.log'))
     
     # Request Configuration
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
-    REQUEST_TIMEOUT = int(os.environ.get('REQUEST_TIMEOUT', 30))
+    # WHY: Attendance payloads are a few KB; a small cap keeps oversized or
+    # abusive bodies from tying up workers while they are read
+    MAX_CONTENT_LENGTH = _LazyEnv(lambda: int(os.environ.get('MAX_CONTENT_LENGTH', 64 * 1024)))  # 64KB
+    REQUEST_TIMEOUT = _LazyEnv(lambda: int(os.environ.get('REQUEST_TIMEOUT', 30)))
     
     # Rate Limiting Configuration
-    RATE_LIMIT = os.environ.get('RATE_LIMIT', '100 per hour')
+    RATE_LIMIT = _LazyEnv(lambda: os.environ.get('RATE_LIMIT', '100 per hour'))
+    RATE_LIMIT_BURST = _LazyEnv(lambda: os.environ.get('RATE_LIMIT_BURST'))  # Optional short-window limit, e.g. "10 per second"
+    
+    # WHY: The default in-memory store keeps a separate counter per gunicorn
+    # worker; a shared backend (redis://, memcached://) enforces limits globally
+    RATELIMIT_STORAGE_URL = _LazyEnv(lambda: os.environ.get('RATELIMIT_STORAGE_URL', 'memory://'))
+    RATELIMIT_STRATEGY = _LazyEnv(lambda: os.environ.get('RATELIMIT_STRATEGY', 'moving-window'))
+    
+    # Notification Queue Configuration
+    NOTIFICATION_QUEUE_SIZE = _LazyEnv(lambda: int(os.environ.get('NOTIFICATION_QUEUE_SIZE', 10000)))
+    NOTIFICATION_WORKERS = _LazyEnv(lambda: int(os.environ.get('NOTIFICATION_WORKERS', os.cpu_count() or 1)))
+    NOTIFICATION_BATCH_SIZE = _LazyEnv(lambda: int(os.environ.get('NOTIFICATION_BATCH_SIZE', 25)))
+    NOTIFICATION_FLUSH_MS = _LazyEnv(lambda: int(os.environ.get('NOTIFICATION_FLUSH_MS', 200)))
+    
+    # WHY: Webhook senders retry identical attendance events; successful
+    # sends are remembered for this many seconds (0 disables deduplication)
+    NOTIFICATION_DEDUP_TTL = _LazyEnv(lambda: int(os.environ.get('NOTIFICATION_DEDUP_TTL', 300)))
+    NOTIFICATION_DEDUP_SIZE = _LazyEnv(lambda: int(os.environ.get('NOTIFICATION_DEDUP_SIZE', 1024)))
+    
+    # WHY: The WSGI entry point warms validation and the Graph API / rate
+    # limit connections before the first request instead of during it
+    WARMUP_ON_START = _LazyEnv(lambda: os.environ.get('WARMUP_ON_START', 'True').lower() in ('true', '1', 'yes'))
+    
+    # WHY: Recipients file is read and validated once per config class;
+    # see invalidate_recipients() to force a reload
+    _recipient_cache: Optional[Tuple[str, ...]] = None
     
     @classmethod
     def validate_required_config(cls) -> None:
@@ -73,17 +198,45 @@ class Config:
             )
     
     @classmethod
-    def get_recipient_numbers(cls) -> List[str]:
+    def get_recipient_numbers(cls) -> Tuple[str, ...]:
         """
-        Get list of recipient phone numbers from file.
+        Get recipient phone numbers from file.
+        
+        The file is parsed on the first call only; subsequent calls
+        return the cached tuple.
         
         Returns:
-            List of phone numbers
+            Tuple of phone numbers
             
         Raises:
             FileNotFoundError: If phone numbers file doesn't exist
             ValueError: If file is empty or contains invalid numbers
         """
+        cached = cls.__dict__.get('_recipient_cache')
+        if cached is None:
+            cached = cls._load_recipient_numbers()
+            cls._recipient_cache = cached
+        return cached
+    
+    @classmethod
+    def invalidate_recipients(cls) -> None:
+        """
+        Drop the cached recipient numbers so the next call re-reads the file.
+        
+        WHY: Each config class caches its own tuple, so the cache is cleared
+        on Config and every subclass; Config.invalidate_recipients() also
+        reaches the class returned by get_config()
+        """
+        pending = [Config]
+        while pending:
+            config_class = pending.pop()
+            if config_class.__dict__.get('_recipient_cache') is not None:
+                config_class._recipient_cache = None
+            pending.extend(config_class.__subclasses__())
+    
+    @classmethod
+    def _load_recipient_numbers(cls) -> Tuple[str, ...]:
+        """Read and validate the phone numbers file (uncached)."""
         try:
             # Get absolute path to phone numbers file
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -92,31 +245,44 @@ class Config:
             if not os.path.exists(phone_file_path):
                 # Fallback to single recipient number if file doesn't exist
                 if cls.WHATSAPP_RECIPIENT_NUMBER:
-                    return [cls.WHATSAPP_RECIPIENT_NUMBER]
+                    return (cls.WHATSAPP_RECIPIENT_NUMBER,)
                 else:
                     raise FileNotFoundError(f"Phone numbers file not found: {phone_file_path}")
             
-            with open(phone_file_path, 'r', encoding='utf-8') as file:
+            with open(phone_file_path, 'rb') as file:
+                data = file.read()
+            
+            # WHY: One C-level regex pass over the whole file replaces the
+            # per-line strip/startswith/isdigit calls
+            numbers = ['+' + match.decode('ascii') for match in _PHONE_LINE_RE.findall(data)]
+            
+            # Every non-empty, non-comment line must be a valid number
+            # WHY: On any disagreement the per-line pass is authoritative, so
+            # a line the regex missed (e.g. a bare \r line break) is either
+            # kept or reported, never silently dropped
+            if len(_CONTENT_LINE_RE.findall(data)) != len(numbers):
                 numbers = []
-                for line_num, line in enumerate(file, 1):
+                for line_num, line in enumerate(data.splitlines(), 1):
                     line = line.strip()
-                    if line and not line.startswith('#'):  # Skip empty lines and comments
-                        # Validate phone number format (should be 11 digits starting with 51)
-                        if len(line) == 11 and line.startswith('51') and line.isdigit():
-                            numbers.append(f"+{line}")
-                        else:
-                            raise ValueError(f"Invalid phone number format at line {line_num}: {line}")
-                
-                if not numbers:
-                    raise ValueError("No valid phone numbers found in file")
-                
-                return numbers
+                    if not line or line[:1] == b'#':
+                        continue
+                    if not _is_phone_line(line):
+                        raise ValueError(
+                            f"Invalid phone number format at line {line_num}: "
+                            f"{line.decode('utf-8', 'replace')}"
+                        )
+                    numbers.append('+' + line.decode('ascii'))
+            
+            if not numbers:
+                raise ValueError("No valid phone numbers found in file")
+            
+            return tuple(numbers)
                 
         except Exception as e:
             # Log the error and fallback to single number if available
             if cls.WHATSAPP_RECIPIENT_NUMBER:
                 print(f"Warning: Error reading phone numbers file: {e}. Using fallback number.")
-                return [cls.WHATSAPP_RECIPIENT_NUMBER]
+                return (cls.WHATSAPP_RECIPIENT_NUMBER,)
             else:
                 raise
     
@@ -134,7 +300,21 @@ class Config:
             'verify_token': cls.WHATSAPP_VERIFY_TOKEN,
             'recipient_numbers': cls.get_recipient_numbers(),  # Now returns list
             'logger': True,
-            'debug': cls.DEBUG
+            'debug': cls.DEBUG,
+            'api_version': cls.WHATSAPP_API_VERSION,
+            'max_workers': cls.WHATSAPP_SEND_WORKERS,
+            'max_in_flight': cls.WHATSAPP_MAX_IN_FLIGHT,
+            'text_rate': cls.WHATSAPP_TEXT_RATE,
+            'media_rate': cls.WHATSAPP_MEDIA_RATE,
+            'breaker_failures': cls.WHATSAPP_BREAKER_FAILURES,
+            'breaker_reset': cls.WHATSAPP_BREAKER_RESET_SECONDS,
+            'max_retries': cls.WHATSAPP_MAX_RETRIES,
+            'retry_base': cls.WHATSAPP_RETRY_BASE_SECONDS,
+            'retry_cap': cls.WHATSAPP_RETRY_MAX_SECONDS,
+            'connect_timeout': cls.WHATSAPP_CONNECT_TIMEOUT,
+            'read_timeout': cls.WHATSAPP_READ_TIMEOUT,
+            'dedup_ttl': cls.NOTIFICATION_DEDUP_TTL,
+            'dedup_size': cls.NOTIFICATION_DEDUP_SIZE
         }
 
 
@@ -186,11 +366,12 @@ class TestingConfig(Config):
     WHATSAPP_PHONE_NUMBER_ID = 'test_phone_id'
     WHATSAPP_VERIFY_TOKEN = 'test_verify_token'
     WHATSAPP_RECIPIENT_NUMBER = '+1234567890'
+    WARMUP_ON_START = False
     
     @classmethod
-    def get_recipient_numbers(cls) -> List[str]:
+    def get_recipient_numbers(cls) -> Tuple[str, ...]:
         """Override to return test numbers."""
-        return ['+1234567890', '+0987654321']
+        return ('+1234567890', '+9876543210')
 
 
 # Configuration mapping for easy environment selection
@@ -202,6 +383,7 @@ config_map = {
 }
 
 
+@lru_cache(maxsize=4)
 def get_config(environment: str = None) -> Config:
     """
     Get configuration class for specified environment.
@@ -213,7 +395,9 @@ def get_config(environment: str = None) -> Config:
         Configuration class instance
         
     WHY: Factory pattern allows dynamic configuration selection
-    based on runtime environment
+    based on runtime environment; results are memoized because both
+    entry points resolve the configuration more than once during boot
     """
+    _load_dotenv_once()
     env = environment or os.environ.get('FLASK_ENV', 'default')
     return config_map.get(env, config_map['default'])
\ No newline at end of file
@@ -10,12 +10,37 @@ clean architecture and easier testing of webhook endpoints.
 """
 
 import logging
+import re
 from typing import Dict, Any, Tuple, Optional
-from datetime import datetime
-from flask import request, jsonify, Response
-import json
+from flask import request, Response
+import msgspec
+import orjson
 
-from services.whatsapp_service import WhatsAppService, WhatsAppServiceError
+from services.whatsapp_service import AttendancePayload, WhatsAppService, WhatsAppServiceError
+from services.notification_queue import NotificationQueue
+from services.timestamps import now_iso
+
+
+class _ExactAttendancePayload(AttendancePayload, forbid_unknown_fields=True):
+    """AttendancePayload that rejects keys outside the schema."""
+
+
+# Attendance schema shared with validate_attendance_data
+# WHY: Bodies with extra keys fail the fast path and are decoded generically,
+# so fields the schema does not know are passed through, not dropped
+_ATTENDANCE_DECODER = msgspec.json.Decoder(_ExactAttendancePayload)
+
+# Canned attendance body used by AttendanceWebhookHandler.warm_up()
+_WARMUP_BODY = orjson.dumps({
+    'nombre': 'Warm Up',
+    'empresa': 'Attendance Notifier',
+    'cargo': 'Startup',
+    'fecha_hora': '2024-01-01 00:00:00'
+})
+
+# WHY: Substring match (as before) so keys like 'user_id' or 'phone_number'
+# are also redacted; one compiled case-insensitive search per key
+_SENSITIVE_KEY_RE = re.compile(r'phone|email|id|token', re.IGNORECASE)
 
 
 class AttendanceWebhookHandler:
@@ -26,16 +51,36 @@ class AttendanceWebhookHandler:
     generation with comprehensive error handling and security measures.
     """
     
-    def __init__(self, whatsapp_service: WhatsAppService):
+    def __init__(
+        self,
+        whatsapp_service: WhatsAppService,
+        notification_queue: Optional[NotificationQueue] = None
+    ):
         """
         Initialize webhook handler with WhatsApp service.
         
         Args:
             whatsapp_service: Configured WhatsAppService instance
+            notification_queue: Optional queue for asynchronous delivery;
+                               notifications are sent inline when omitted
         """
         self.whatsapp_service = whatsapp_service
+        self.notification_queue = notification_queue
         self.logger = logging.getLogger(__name__)
     
+    def warm_up(self) -> None:
+        """
+        Run a canned payload through decoding, validation and formatting.
+        
+        WHY: First-use setup in the decoding and validation path happens
+        before serving (once in the gunicorn master under --preload)
+        rather than on the first webhook
+        """
+        attendance_data, payload = self._decode_attendance_payload(_WARMUP_BODY)
+        self.whatsapp_service.validate_attendance_data(attendance_data, payload)
+        self.whatsapp_service.format_attendance_message(attendance_data)
+        now_iso()
+    
     def handle_attendance_webhook(self) -> Tuple[Dict[str, Any], int]:
         """
         Handle incoming attendance webhook POST requests.
@@ -73,11 +118,11 @@ class AttendanceWebhookHandler:
             
             # Parse JSON payload
             try:
-                attendance_data = request.get_json()
+                attendance_data, payload = self._decode_attendance_payload(request.get_data())
                 if not attendance_data:
                     raise ValueError("Empty JSON payload")
                     
-            except (ValueError, json.JSONDecodeError) as e:
+            except (ValueError, orjson.JSONDecodeError) as e:
                 self.logger.warning(f"Invalid JSON payload: {e}")
                 return {
                     'success': False,
@@ -86,10 +131,12 @@ class AttendanceWebhookHandler:
                 }, 400
             
             # Log received data (exclude sensitive information)
-            self.logger.debug(f"Received attendance data: {self._sanitize_log_data(attendance_data)}")
+            # WHY: Guarded so the sanitized copy is only built when DEBUG is on
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Received attendance data: %s", self._sanitize_log_data(attendance_data))
             
             # Validate attendance data structure and content
-            is_valid, validation_error = self.whatsapp_service.validate_attendance_data(attendance_data)
+            is_valid, validation_error = self.whatsapp_service.validate_attendance_data(attendance_data, payload)
             if not is_valid:
                 self.logger.warning(f"Attendance data validation failed: {validation_error}")
                 return {
@@ -98,6 +145,36 @@ class AttendanceWebhookHandler:
                     'message': validation_error
                 }, 400
             
+            # WHY: Fields read once after validation; photo normalized to
+            # None when absent or empty
+            nombre = attendance_data['nombre']
+            empresa = attendance_data['empresa']
+            photo = attendance_data.get('photo') or None
+            
+            # WHY: Acknowledge immediately and let queue workers talk to
+            # WhatsApp; a full queue asks the sender to retry later
+            if self.notification_queue is not None:
+                if not self.notification_queue.submit(attendance_data):
+                    return {
+                        'success': False,
+                        'error': 'Queue full',
+                        'message': 'Notification queue is full, please retry later'
+                    }, 503
+                
+                self.logger.info(f"Queued attendance notification for {nombre} from {empresa}")
+                
+                return {
+                    'success': True,
+                    'message': 'Attendance notification queued',
+                    'data': {
+                        'employee_name': nombre,
+                        'company': empresa,
+                        'timestamp': now_iso(),
+                        'has_photo': photo is not None,
+                        'photo_url': photo
+                    }
+                }, 202
+            
             # Send WhatsApp notification
             success, response_data = self.whatsapp_service.send_attendance_notification(attendance_data)
             
@@ -111,9 +188,9 @@ class AttendanceWebhookHandler:
                     'success': True,
                     'message': 'Attendance notification batch completed',
                     'data': {
-                        'employee_name': attendance_data['nombre'],
-                        'company': attendance_data['empresa'],
-                        'timestamp': datetime.now().isoformat(),
+                        'employee_name': nombre,
+                        'company': empresa,
+                        'timestamp': now_iso(),
                         'has_photo': response_data.get('has_photo', False),
                         'photo_url': response_data.get('photo_url'),
                         'batch_results': {
@@ -132,8 +209,8 @@ class AttendanceWebhookHandler:
                 total_count = batch_summary.get('total_recipients', 0)
                 
                 self.logger.info(
-                    f"Successfully processed attendance{photo_status} for {attendance_data['nombre']} "
-                    f"from {attendance_data['empresa']} - Sent to {success_count}/{total_count} recipients"
+                    f"Successfully processed attendance{photo_status} for {nombre} "
+                    f"from {empresa} - Sent to {success_count}/{total_count} recipients"
                 )
                 
                 return response, 200
@@ -149,8 +226,8 @@ class AttendanceWebhookHandler:
                     'error': 'Notification failed',
                     'message': f'Failed to send WhatsApp notification: {error_msg}',
                     'data': {
-                        'employee_name': attendance_data['nombre'],
-                        'company': attendance_data['empresa'],
+                        'employee_name': nombre,
+                        'company': empresa,
                         'batch_summary': batch_summary
                     }
                 }, 500
@@ -187,12 +264,14 @@ class AttendanceWebhookHandler:
         """
         try:
             service_status = self.whatsapp_service.get_service_status()
+            if self.notification_queue is not None:
+                service_status['notification_queue'] = self.notification_queue.get_status()
             
             return {
                 'success': True,
                 'status': 'healthy',
                 'service_info': service_status,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }, 200
             
         except Exception as e:
@@ -201,7 +280,7 @@ class AttendanceWebhookHandler:
                 'success': False,
                 'status': 'unhealthy',
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }, 503
     
     def handle_webhook_verification(self, verify_token: str) -> Response:
@@ -239,6 +318,37 @@ class AttendanceWebhookHandler:
             self.logger.error(f"Error during webhook verification: {e}")
             return Response('Verification error', status=500)
     
+    def _decode_attendance_payload(self, body: bytes) -> Tuple[Any, Optional[AttendancePayload]]:
+        """
+        Decode the webhook body into attendance data.
+        
+        Args:
+            body: Raw request body
+            
+        Returns:
+            Tuple of (attendance_data, payload): the decoded body (a dict for
+            well-formed attendance data) and its AttendancePayload when the
+            schema accepted it, otherwise None
+            
+        Raises:
+            orjson.JSONDecodeError: If the body is not valid JSON
+            
+        WHY: Well-formed payloads are decoded and type/length-checked in a
+        single msgspec pass straight from bytes; anything the schema rejects
+        (including bodies with extra keys, which are kept as sent) is
+        re-parsed generically so validate_attendance_data can report the
+        specific, documented error (or accept legacy non-string values)
+        """
+        try:
+            payload = _ATTENDANCE_DECODER.decode(body)
+        except msgspec.DecodeError:
+            return orjson.loads(body), None
+        
+        attendance_data = msgspec.structs.asdict(payload)
+        if attendance_data['photo'] is None:
+            del attendance_data['photo']
+        return attendance_data, payload
+    
     def _sanitize_log_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Sanitize sensitive data for logging.
@@ -255,16 +365,10 @@ class AttendanceWebhookHandler:
         if not isinstance(data, dict):
             return data
         
-        sanitized = {}
-        sensitive_fields = ['phone', 'email', 'id', 'token']
-        
-        for key, value in data.items():
-            if any(sensitive in key.lower() for sensitive in sensitive_fields):
-                sanitized[key] = '[REDACTED]'
-            else:
-                sanitized[key] = value
-        
-        return sanitized
+        return {
+            key: '[REDACTED]' if _SENSITIVE_KEY_RE.search(key) else value
+            for key, value in data.items()
+        }
     
     def format_error_response(
         self, 
@@ -289,7 +393,7 @@ class AttendanceWebhookHandler:
             'success': False,
             'error': error_code,
             'message': message,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         if details:
@@ -298,6 +402,30 @@ class AttendanceWebhookHandler:
         return response
 
 
+# WHY: The service description never changes, so it is serialized once at
+# import and the root route (often polled by probes) returns it as-is
+_ROOT_BODY = orjson.dumps({
+    'service': 'WhatsApp Attendance Notifier',
+    'version': '1.0.0',
+    'status': 'active',
+    'endpoints': {
+        'attendance_webhook': '/attendance-webhook',
+        'health_check': '/health',
+        'webhook_verification': '/attendance-webhook?hub.mode=subscribe&hub.verify_token=TOKEN&hub.challenge=CHALLENGE'
+    }
+})
+
+
+def _json_response(data: Dict[str, Any], status_code: int = 200) -> Response:
+    """
+    Serialize data with orjson into a JSON response.
+    
+    WHY: orjson produces the bytes body directly, skipping jsonify's
+    provider dispatch and str->bytes re-encoding on every route
+    """
+    return Response(orjson.dumps(data), status=status_code, mimetype='application/json')
+
+
 def create_webhook_routes(app, webhook_handler: AttendanceWebhookHandler, verify_token: str):
     """
     Create Flask routes for webhook handling.
@@ -310,34 +438,30 @@ def create_webhook_routes(app, webhook_handler: AttendanceWebhookHandler, verify
     WHY: Factory function to create routes with proper dependency injection
     """
     
+    # WHY: Handler methods bound once so each route calls a closure
+    # variable directly instead of resolving the attribute per request
+    handle_attendance = webhook_handler.handle_attendance_webhook
+    handle_verification = webhook_handler.handle_webhook_verification
+    handle_health = webhook_handler.handle_health_check
+    
     @app.route('/attendance-webhook', methods=['POST'])
     def attendance_webhook():
         """Handle attendance notification webhook."""
-        response_data, status_code = webhook_handler.handle_attendance_webhook()
-        return jsonify(response_data), status_code
+        response_data, status_code = handle_attendance()
+        return _json_response(response_data, status_code)
     
     @app.route('/attendance-webhook', methods=['GET'])
     def webhook_verification():
         """Handle webhook verification."""
-        return webhook_handler.handle_webhook_verification(verify_token)
+        return handle_verification(verify_token)
     
     @app.route('/health', methods=['GET'])
     def health_check():
         """Handle health check requests."""
-        response_data, status_code = webhook_handler.handle_health_check()
-        return jsonify(response_data), status_code
+        response_data, status_code = handle_health()
+        return _json_response(response_data, status_code)
     
     @app.route('/', methods=['GET'])
     def root():
         """Root endpoint with basic service information."""
-        return jsonify({
-            'service': 'WhatsApp Attendance Notifier',
-            'version': '1.0.0',
-            'status': 'active',
-            'endpoints': {
-                'attendance_webhook': '/attendance-webhook',
-                'health_check': '/health',
-                'webhook_verification': '/attendance-webhook?hub.mode=subscribe&hub.verify_token=TOKEN&hub.challenge=CHALLENGE'
-            },
-            'timestamp': datetime.now().isoformat()
-        })
\ No newline at end of file
+        return Response(_ROOT_BODY, mimetype='application/json')
\ No newline at end of file
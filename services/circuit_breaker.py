@@ -0,0 +1,114 @@
+"""
+Circuit Breaker for the WhatsApp Graph API.
+
+This module provides a thread-safe circuit breaker that stops outbound
+sends after repeated failures and probes the API before resuming.
+
+WHY: During a Graph API outage every recipient would otherwise wait
+through timeouts and retries; failing fast keeps batches quick and logs
+readable until a probe shows the API is back.
+"""
+
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker.
+
+    Closed: requests flow; consecutive failures are counted.
+    Open: requests are rejected until the reset timeout elapses.
+    Half-open: a single probe request is allowed; success closes the
+    circuit, failure re-opens it with a doubled reset timeout. A probe
+    that has not reported back within the reset timeout is abandoned and
+    the next caller becomes the probe.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before the first probe
+            max_reset_timeout: Upper bound for the doubled reset timeout
+        """
+        self._failure_threshold = max(1, failure_threshold)
+        self._base_reset_timeout = reset_timeout
+        self._max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self._reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current circuit state."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now.
+
+        Returns:
+            True if closed, or if this caller is the half-open probe
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            now = time.monotonic()
+            if self._state == self.OPEN and now - self._opened_at >= self._reset_timeout:
+                # WHY: Exactly one caller becomes the probe; others keep
+                # failing fast until it reports back
+                self._state = self.HALF_OPEN
+                self._probe_started = now
+                return True
+
+            if self._state == self.HALF_OPEN and now - self._probe_started >= self._reset_timeout:
+                # WHY: A probe that never reported back must not leave the
+                # circuit half-open forever
+                self._probe_started = now
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._reset_timeout = self._base_reset_timeout
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit when the threshold is reached."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._reset_timeout = min(self._max_reset_timeout, self._reset_timeout * 2)
+                self._open()
+                return
+
+            self._failures += 1
+            if self._state == self.CLOSED and self._failures >= self._failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        """Switch to open state (caller holds the lock)."""
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._failures = 0
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Notification Queue Module for Asynchronous WhatsApp Delivery.
+
+This module provides a bounded in-process queue drained by a pool of
+background worker threads that perform the outbound WhatsApp API calls.
+
+WHY: Webhook senders enforce delivery-time limits; acknowledging the
+webhook as soon as the payload is validated and enqueued decouples the
+response latency from WhatsApp API latency and absorbs traffic spikes.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Tuple
+
+from services.whatsapp_service import WhatsAppService
+
+
+# Sentinel placed on the queue to tell a worker to exit
+_STOP = object()
+
+
+class NotificationQueue:
+    """
+    Bounded queue of attendance notifications with a worker pool.
+
+    Webhook handlers enqueue validated attendance data with submit();
+    worker threads dequeue it in batches and send it through the
+    WhatsApp service.
+    """
+
+    def __init__(
+        self,
+        whatsapp_service: WhatsAppService,
+        maxsize: int = 10000,
+        workers: int = 1,
+        batch_size: int = 25,
+        flush_ms: int = 200
+    ):
+        """
+        Initialize notification queue.
+
+        Args:
+            whatsapp_service: Configured WhatsAppService instance
+            maxsize: Maximum number of pending notifications
+            workers: Number of background worker threads
+            batch_size: Maximum notifications handed to the service at once
+            flush_ms: Maximum milliseconds to wait while filling a batch
+        """
+        self.whatsapp_service = whatsapp_service
+        self.logger = logging.getLogger(__name__)
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._worker_count = max(1, workers)
+        self._batch_size = max(1, batch_size)
+        self._flush_seconds = max(0, flush_ms) / 1000
+        self._workers: List[threading.Thread] = []
+        
+        # WHY: Under gunicorn --preload the queue is started in the master
+        # and forked workers inherit none of its threads
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_after_fork)
+
+    def start(self) -> None:
+        """
+        Start the background worker threads.
+
+        WHY: Workers are daemon threads so a hung WhatsApp call can never
+        block interpreter shutdown; stop() drains the queue explicitly
+        """
+        for index in range(self._worker_count):
+            worker = threading.Thread(
+                target=self._worker,
+                name=f"notification-worker-{index + 1}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        self.logger.info("Notification queue started with %d workers", self._worker_count)
+
+    def _restart_after_fork(self) -> None:
+        """
+        Give a forked child its own queue and worker threads.
+        
+        WHY: The parent's worker threads do not exist in the child and its
+        queue locks may have been held mid-operation at fork time
+        """
+        if not self._workers:
+            return
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._workers = []
+        self.start()
+    
+    def submit(self, attendance_data: Dict[str, Any]) -> bool:
+        """
+        Enqueue attendance data for delivery without blocking.
+
+        Args:
+            attendance_data: Validated attendance data
+
+        Returns:
+            True if enqueued, False if the queue is full
+        """
+        try:
+            self._queue.put_nowait(attendance_data)
+            return True
+        except queue.Full:
+            self.logger.warning("Notification queue is full (%d pending)", self._queue.qsize())
+            return False
+
+    @property
+    def depth(self) -> int:
+        """Number of notifications waiting to be sent."""
+        return self._queue.qsize()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get queue backlog information for health reporting.
+
+        Returns:
+            Dictionary with pending depth, capacity and worker count
+        """
+        return {
+            'depth': self._queue.qsize(),
+            'capacity': self._queue.maxsize,
+            'workers': self._worker_count
+        }
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        Drain pending notifications and stop the workers.
+
+        Args:
+            timeout: Maximum seconds to wait for each worker to finish
+
+        WHY: Registered at exit so notifications accepted with 202 are
+        still delivered on graceful shutdown
+        """
+        workers, self._workers = self._workers, []
+        if not workers:
+            return
+
+        self.logger.info("Stopping notification queue (%d pending)", self._queue.qsize())
+
+        # WHY: Sentinels queue behind pending items, so workers drain first
+        for _ in workers:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                self.logger.warning("Notification queue still full, giving up on drain")
+                return
+
+        for worker in workers:
+            worker.join(timeout)
+
+    def _worker(self) -> None:
+        """Worker loop: send queued notifications in batches until a stop sentinel arrives."""
+        while True:
+            batch, stop = self._next_batch()
+            try:
+                if batch:
+                    self._deliver(batch)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+
+            if stop:
+                return
+
+    def _next_batch(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Collect up to batch_size notifications or until flush_ms elapses.
+
+        Returns:
+            Tuple of (batch, stop_requested)
+
+        WHY: Blocks for the first item only; afterwards waits at most the
+        flush interval so a lone notification is never held back long
+        """
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self._flush_seconds
+
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        """Send a batch through the WhatsApp service and log failed notifications."""
+        try:
+            results = self.whatsapp_service.send_batch(batch)
+        except Exception as e:
+            self.logger.error("Unexpected error in notification worker: %s", e)
+            return
+
+        for item, (success, response_data) in zip(batch, results):
+            if not success:
+                self.logger.error(
+                    "Queued notification for %s failed: %s",
+                    item.get('nombre', 'unknown'),
+                    response_data.get('error', 'Batch sending failed')
+                )
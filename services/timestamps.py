@@ -0,0 +1,33 @@
+"""
+Timestamp Helpers for API Responses.
+
+This module provides ISO-8601 timestamps cached at second granularity
+for the timestamp fields included in webhook and health responses.
+
+WHY: Under load many responses are built within the same second;
+formatting the local time once per second turns each timestamp into a
+tuple read instead of a datetime construction and isoformat() call.
+"""
+
+import time
+from datetime import datetime
+
+# (epoch second, formatted timestamp); replaced as a whole so readers on
+# other threads always see a consistent pair
+_cached_timestamp = (None, '')
+
+
+def now_iso() -> str:
+    """
+    Get the current local time as an ISO-8601 string (second precision).
+    
+    Returns:
+        Timestamp such as '2023-12-07T14:30:15'
+    """
+    global _cached_timestamp
+    second = int(time.time())
+    cached_second, cached_text = _cached_timestamp
+    if second != cached_second:
+        cached_text = datetime.fromtimestamp(second).isoformat()
+        _cached_timestamp = (second, cached_text)
+    return cached_text
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Token Bucket Rate Limiter for Outbound WhatsApp Sends.
+
+This module provides a thread-safe token bucket used to pace Graph API
+requests below the provider's messages-per-second limits.
+
+WHY: With concurrent fan-out a large batch would otherwise burst past the
+provider ceiling and turn into 429 responses and retry delays; pacing on
+the client keeps throughput steady at the allowed rate.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a fixed rate.
+
+    Each acquire() takes one token, waiting for the refill when the
+    bucket is empty, so callers proceed at most `rate` times per second
+    after an initial burst of up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        self._rate = rate
+        self._capacity = max(1.0, capacity)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Take one token, blocking until one is available.
+
+        WHY: Sleeps outside the lock so other threads can refill and
+        compute their own wait instead of queueing on the mutex
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self._rate
+
+            time.sleep(wait)
\ No newline at end of file
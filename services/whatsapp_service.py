@@ -10,15 +10,100 @@ business logic and provides a clean interface for messaging operations.
 """
 
 import logging
-import sys
 import os
-from typing import Dict, Any, Optional, Tuple, List
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Dict, Any, Optional, Tuple, List
 from datetime import datetime
+from functools import lru_cache
 
-# Add whatsapp-python to Python path
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'whatsapp-python'))
+import msgspec
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
-from whatsapp import WhatsApp, Message
+# WHY: whatsapp-python is an installed dependency (requirements.txt); a
+# checkout next to the project can be installed with pip install -e
+from whatsapp import WhatsApp
+
+from services.circuit_breaker import CircuitBreaker
+from services.timestamps import now_iso
+from services.token_bucket import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Graph API host serving the WhatsApp Cloud API
+_GRAPH_API_BASE_URL = 'https://graph.facebook.com'
+
+# Recipient phone numbers: E.164 digits with optional + prefix
+_RECIPIENT_NUMBER_RE = re.compile(r'\+?[1-9][0-9]{7,14}\Z')
+
+# Graph API responses worth retrying (rate limited or server-side errors)
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Attendance fields every notification must carry
+_REQUIRED_FIELDS = ('nombre', 'empresa', 'cargo', 'fecha_hora')
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+
+# WHY: Limits prevent message truncation
+_MAX_LENGTHS = {
+    'nombre': 100,
+    'empresa': 100,
+    'cargo': 100
+}
+
+
+def _text_field(max_length: int) -> Any:
+    """Non-empty string field type bounded by max_length."""
+    return Annotated[str, msgspec.Meta(min_length=1, max_length=max_length)]
+
+
+class AttendancePayload(msgspec.Struct):
+    """
+    Typed attendance data, checked in one C-level pass by msgspec.
+    
+    WHY: Shared by the webhook decoder and validate_attendance_data so the
+    schema and the manual checks it short-circuits cannot drift apart
+    """
+    nombre: _text_field(_MAX_LENGTHS['nombre'])
+    empresa: _text_field(_MAX_LENGTHS['empresa'])
+    cargo: _text_field(_MAX_LENGTHS['cargo'])
+    fecha_hora: Annotated[str, msgspec.Meta(min_length=1)]
+    photo: Optional[str] = None
+
+
+# Common image extensions at the end of a photo URL (URLs without one are
+# allowed with a warning)
+# WHY: Anchored at the end with no leading wildcard, so the search stays
+# linear however the URL is padded
+_PHOTO_EXT_RE = re.compile(r'\.(?:jpe?g|png|gif|bmp|webp)\Z', re.IGNORECASE)
+
+_PHOTO_URL_MAX_LENGTH = 2000
+
+# Notification text, filled with str.format_map(attendance_data)
+_MESSAGE_TEMPLATE = """📋 *Nueva Asistencia Registrada*
+
+👤 *Nombre:* {nombre}
+🏢 *Empresa:* {empresa}
+💼 *Cargo:* {cargo}
+📅 *Fecha/Hora:* {fecha_hora}
+
+✅ Ingreso confirmado al evento"""
+
+# Accepted fecha_hora shapes: 'YYYY-MM-DD HH:MM:SS' or 'DD/MM/YYYY HH:MM'
+# WHY: Mirrors datetime.strptime: single-digit or space-padded days and
+# single-digit fields are allowed, the space in the format matches any
+# whitespace run, and only ASCII digits count ([0-9], not Unicode \d)
+_FECHA_HORA_RE = re.compile(
+    r'(?P<y1>[0-9]{4})-(?P<m1>[0-9]{1,2})-(?P<d1>[0-9]{1,2}| [1-9])'
+    r'\s+(?P<H1>[0-9]{1,2}):(?P<M1>[0-9]{1,2}):(?P<S1>[0-9]{1,2})'
+    r'|(?P<d2>[0-9]{1,2}| [1-9])/(?P<m2>[0-9]{1,2})/(?P<y2>[0-9]{4})'
+    r'\s+(?P<H2>[0-9]{1,2}):(?P<M2>[0-9]{1,2})'
+)
 
 
 class WhatsAppService:
@@ -41,25 +126,213 @@ class WhatsAppService:
                    - recipient_numbers: List of recipient numbers
                    - logger: Enable/disable logging
                    - debug: Enable/disable debug mode
+                   - api_version: Optional pinned Graph API version (e.g. v18.0)
+                   - max_workers: Threads used to send to recipients in parallel
+                   - max_in_flight: Maximum simultaneous Graph API requests
+                   - text_rate: Text messages per second (0 disables pacing)
+                   - media_rate: Image messages per second (0 disables pacing)
+                   - breaker_failures: Consecutive API failures that open the circuit
+                   - breaker_reset: Seconds the circuit stays open before probing
+                   - max_retries: Retries for timeouts, 429 and 5xx responses
+                   - retry_base: Initial backoff delay in seconds
+                   - retry_cap: Maximum backoff delay in seconds
+                   - connect_timeout: Graph API connect timeout in seconds
+                   - read_timeout: Graph API read timeout in seconds
+                   - dedup_ttl: Seconds to remember successful sends (0 disables)
+                   - dedup_size: Maximum remembered sends
         """
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # WHY: Retried webhooks replay the stored result instead of sending
+        # again; insertion-ordered so the oldest entry is evicted first
+        self._dedup = OrderedDict()  # key -> (stored_at, response_data)
+        self._dedup_ttl = config.get('dedup_ttl', 300)
+        self._dedup_size = config.get('dedup_size', 1024)
+        self._dedup_lock = threading.Lock()
+        
+        # WHY: The whatsapp-python client scrapes the Graph API changelog and
+        # checks PyPI when constructed; it is built on first use (see
+        # messenger) so startup and preloaded workers make no network calls
+        self._messenger = None
+        self._messenger_lock = threading.Lock()
+        
         try:
-            # WHY: Initialize WhatsApp client with error handling
-            self.messenger = WhatsApp(
-                token=config['token'],
-                phone_number_id=config['phone_number_id'],
-                logger=config.get('logger', True),
-                debug=config.get('debug', False)
+            # WHY: Recipients are checked once here rather than on every send;
+            # invalid entries are dropped with a warning
+            self.recipient_numbers = self._valid_recipients(config['recipient_numbers'])
+            
+            # WHY: Image messages address recipients without the '+' prefix;
+            # normalize the static list once instead of on every send
+            self._recipient_digits = tuple(number.lstrip('+') for number in self.recipient_numbers)
+            
+            # WHY: Status fields are fixed after init; /health only adds a timestamp
+            self._status_base = {
+                'service': 'WhatsApp Attendance Notifier',
+                'status': 'active',
+                'phone_number_id': next(iter(config['phone_number_id'].values())),
+                'recipient_count': len(self.recipient_numbers),
+                # Masked numbers: only the last 4 digits are shown
+                'recipient_numbers': ['*' * max(0, len(num) - 4) + num[-4:] for num in self.recipient_numbers],
+                'debug_mode': config.get('debug', False),
+                'logger_enabled': config.get('logger', True)
+            }
+            
+            max_workers = max(1, config.get('max_workers', 10))
+            
+            # WHY: Sends POST straight to the Graph messages endpoint; a pinned
+            # version avoids depending on the library's detected release
+            # (None resolves through the messenger on the first send)
+            api_version = config.get('api_version')
+            if api_version:
+                phone_number_id = next(iter(config['phone_number_id'].values()))
+                self._messages_url = f"{_GRAPH_API_BASE_URL}/{api_version}/{phone_number_id}/messages"
+            else:
+                self._messages_url = None
+            
+            self._max_workers = max_workers
+            self._http = self._build_http_session()
+            
+            # WHY: Recipient sends are network-bound, so they fan out on a
+            # shared pool; the semaphore caps in-flight requests across all
+            # notifications using this service
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='whatsapp-send'
+            )
+            
+            # WHY: Under gunicorn --preload the service is built in the master;
+            # pooled sockets and send threads must not be shared with workers
+            if hasattr(os, 'register_at_fork'):
+                os.register_at_fork(after_in_child=self._reset_after_fork)
+            self._in_flight = threading.Semaphore(max(1, config.get('max_in_flight', 25)))
+            
+            # WHY: Text and media have separate provider limits
+            text_rate = config.get('text_rate', 25)
+            media_rate = config.get('media_rate', 1.5)
+            self._text_bucket = TokenBucket(text_rate, text_rate) if text_rate > 0 else None
+            self._media_bucket = TokenBucket(media_rate, 2) if media_rate > 0 else None
+            
+            self._breaker = CircuitBreaker(
+                failure_threshold=config.get('breaker_failures', 5),
+                reset_timeout=config.get('breaker_reset', 30.0)
             )
-            self.recipient_numbers = config['recipient_numbers']
-            self.logger.info(f"WhatsApp service initialized successfully with {len(self.recipient_numbers)} recipients")
+            
+            self._max_retries = max(0, config.get('max_retries', 3))
+            self._retry_base = config.get('retry_base', 1.0)
+            self._retry_cap = config.get('retry_cap', 30.0)
+            self._timeout = (config.get('connect_timeout', 3.0), config.get('read_timeout', 10.0))
+            self.logger.info("WhatsApp service initialized successfully with %d recipients", len(self.recipient_numbers))
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize WhatsApp service: {e}")
+            self.logger.error("Failed to initialize WhatsApp service: %s", e)
             raise
     
+    def _build_http_session(self) -> requests.Session:
+        """
+        Create the pooled Graph API session.
+        
+        WHY: One pooled session keeps TLS connections to the Graph API
+        alive across sends instead of the library's per-call
+        requests.post() handshakes; the pool holds a connection per send
+        thread and the library's auth headers are set once on the session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max(32, self._max_workers), max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Content-Type': 'application/json',
+            'Authorization': f"Bearer {self.config['token']}"
+        })
+        return session
+    
+    def _reset_after_fork(self) -> None:
+        """
+        Give a forked child its own HTTP session, send pool and client lock.
+        
+        WHY: Inherited keep-alive sockets would be shared with the parent,
+        the parent's send threads do not exist in the child, and the client
+        lock may have been held mid-build at fork time
+        """
+        self._http = self._build_http_session()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix='whatsapp-send'
+        )
+        self._messenger_lock = threading.Lock()
+    
+    def warm_up(self) -> None:
+        """
+        Open a pooled Graph API connection ahead of the first send.
+        
+        WHY: DNS, TCP and TLS setup (and the library's version lookup when
+        no API version is pinned) happen at startup instead of delaying the
+        first notification; failures are only logged, sends retry normally
+        """
+        started = time.monotonic()
+        try:
+            if self._messages_url is None:
+                self._messages_url = self.messenger.url
+            self._http.head(_GRAPH_API_BASE_URL, timeout=self._timeout)
+        except Exception as e:
+            self.logger.warning("Graph API warm-up failed: %s", e)
+            return
+        self.logger.info("Graph API connection warmed up in %.2fs", time.monotonic() - started)
+    
+    @property
+    def messenger(self) -> WhatsApp:
+        """
+        whatsapp-python client, created on first access.
+        
+        WHY: Double-checked under a lock so concurrent first sends build a
+        single client; later reads skip the lock. The constructor calls
+        logging.disable() process-wide (with debug or logger off); the
+        previous level is restored so the app's logging keeps working
+        """
+        messenger = self._messenger
+        if messenger is None:
+            with self._messenger_lock:
+                messenger = self._messenger
+                if messenger is None:
+                    disabled_level = logging.root.manager.disable
+                    try:
+                        messenger = WhatsApp(
+                            token=self.config['token'],
+                            phone_number_id=self.config['phone_number_id'],
+                            logger=self.config.get('logger', True),
+                            debug=self.config.get('debug', False)
+                        )
+                    finally:
+                        logging.disable(disabled_level)
+                    self._messenger = messenger
+                    self.logger.info("WhatsApp client initialized successfully (Graph API %s)", messenger.LATEST)
+        return messenger
+    
+    def _valid_recipients(self, numbers: List[str]) -> Tuple[str, ...]:
+        """
+        Filter configured recipients down to well-formed phone numbers.
+        
+        Args:
+            numbers: Configured recipient numbers
+        
+        Returns:
+            Tuple of valid numbers, in configured order
+        
+        Raises:
+            ValueError: If no configured number is valid
+        """
+        valid = []
+        for number in numbers:
+            if _RECIPIENT_NUMBER_RE.match(number):
+                valid.append(number)
+            else:
+                self.logger.warning("Ignoring invalid recipient number: %s", number)
+        
+        if not valid:
+            raise ValueError("No valid recipient numbers configured")
+        return tuple(valid)
+    
     def format_attendance_message(self, attendance_data: Dict[str, str]) -> str:
         """
         Format attendance data into WhatsApp message.
@@ -79,28 +352,21 @@ class WhatsAppService:
         """
         try:
             # WHY: Validate required fields before formatting
-            required_fields = ['nombre', 'empresa', 'cargo', 'fecha_hora']
-            missing_fields = [field for field in required_fields 
-                            if field not in attendance_data or not attendance_data[field]]
-            
-            if missing_fields:
+            if not _REQUIRED_FIELD_SET <= attendance_data.keys() or not all(
+                attendance_data[field] for field in _REQUIRED_FIELDS
+            ):
+                missing_fields = [field for field in _REQUIRED_FIELDS
+                                if field not in attendance_data or not attendance_data[field]]
                 raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
             
             # Format the message with emojis and structure
-            message = f"""📋 *Nueva Asistencia Registrada*
-
-👤 *Nombre:* {attendance_data['nombre']}
-🏢 *Empresa:* {attendance_data['empresa']}
-💼 *Cargo:* {attendance_data['cargo']}
-📅 *Fecha/Hora:* {attendance_data['fecha_hora']}
-
-✅ Ingreso confirmado al evento"""
+            message = _MESSAGE_TEMPLATE.format_map(attendance_data)
             
-            self.logger.debug(f"Formatted attendance message for {attendance_data['nombre']}")
+            self.logger.debug("Formatted attendance message for %s", attendance_data['nombre'])
             return message
             
         except Exception as e:
-            self.logger.error(f"Error formatting attendance message: {e}")
+            self.logger.error("Error formatting attendance message: %s", e)
             raise
     
     def send_attendance_notification(
@@ -122,72 +388,151 @@ class WhatsAppService:
         WHY: Main business method that orchestrates message formatting
         and sending to multiple recipients with comprehensive error handling.
         """
+        return self._collect(self._dispatch(attendance_data, recipients))
+    
+    def _dispatch(
+        self,
+        attendance_data: Dict[str, str],
+        recipients: Optional[List[str]] = None,
+        pending: Optional[Dict[tuple, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Submit the per-recipient sends for one notification without waiting.
+        
+        Args:
+            attendance_data: Dictionary containing attendance information
+            recipients: Optional list of recipient numbers (uses default if None)
+            pending: Jobs already dispatched in the same batch, by dedup key
+        
+        Returns:
+            Job dictionary for _collect(); holds a final 'result' when
+            nothing had to be sent
+            
+        WHY: Splitting submission from collection lets send_batch put the
+        sends of a whole burst on the pool before waiting on any of them
+        """
+        # Use provided recipients or default from config
+        # WHY: Bound before the try so the error path can always report them
+        target_numbers = recipients or self.recipient_numbers
+        total_recipients = len(target_numbers)
+        
         try:
-            # Use provided recipients or default from config
-            target_numbers = recipients or self.recipient_numbers
+            if recipients:
+                target_digits = [number.lstrip('+') for number in recipients]
+            else:
+                target_digits = self._recipient_digits
             
             # WHY: Validate phone numbers list
             if not target_numbers:
                 raise ValueError("No recipient numbers provided")
             
-            # Initialize tracking variables
-            successful_sends = []
-            failed_sends = []
-            total_recipients = len(target_numbers)
+            # WHY: Identical attendance events to the same recipients within
+            # the TTL were already delivered; replay the stored result
+            dedup_key = self._dedup_key(attendance_data, target_numbers)
+            if dedup_key is not None:
+                cached = self._dedup_lookup(dedup_key)
+                if cached is not None:
+                    self.logger.info(
+                        "Skipping duplicate attendance notification for %s", attendance_data['nombre']
+                    )
+                    return {'result': (True, cached)}
+                
+                # WHY: A repeat within the same batch has no stored result
+                # yet; it shares the outcome of the first occurrence
+                if pending is not None and dedup_key in pending:
+                    return {'duplicate_of': pending[dedup_key]}
             
             # Check if photo is included in attendance data
             photo_url = attendance_data.get('photo')
             message_content = self.format_attendance_message(attendance_data)
             
-            self.logger.info(f"Starting batch send to {total_recipients} recipients for employee {attendance_data['nombre']}")
-            
-            # Send to each recipient
-            for i, target_number in enumerate(target_numbers, 1):
-                try:
-                    self.logger.debug(f"Sending to recipient {i}/{total_recipients}: {target_number}")
-                    
-                    if photo_url:
-                        # Send image with caption
-                        response = self.messenger.send_image(
-                            image=photo_url,
-                            recipient_id=target_number.replace('+', ''),  # Remove + prefix
-                            caption=message_content,
-                            link=True  # URL-based image
-                        )
-                    else:
-                        # Send text-only message
-                        message = Message(
-                            instance=self.messenger,
-                            content=message_content,
-                            to=target_number,
-                            rec_type="individual"
-                        )
-                        response = message.send()
-                    
-                    # Check if send was successful
-                    if response and 'messages' in response:
-                        message_id = response.get('messages', [{}])[0].get('id', 'unknown')
-                        successful_sends.append({
-                            'number': target_number,
-                            'message_id': message_id,
-                            'response': response
-                        })
-                        self.logger.debug(f"Successfully sent to {target_number} (ID: {message_id})")
-                    else:
-                        failed_sends.append({
-                            'number': target_number,
-                            'error': f"Invalid response: {response}",
-                            'response': response
-                        })
-                        self.logger.warning(f"Failed to send to {target_number}: Invalid response")
-                        
-                except Exception as send_error:
-                    failed_sends.append({
-                        'number': target_number,
-                        'error': str(send_error),
-                        'response': None
-                    })
-                    self.logger.error(f"Error sending to {target_number}: {send_error}")
+            self.logger.info(
+                "Starting batch send to %d recipients for employee %s",
+                total_recipients, attendance_data['nombre']
+            )
+            
+            # WHY: Level checked once per batch rather than per recipient
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+            
+            # WHY: Message body is identical for every recipient; build it
+            # once and only vary the 'to' field per send
+            if photo_url:
+                # Image with caption, addressed without the + prefix
+                base_payload = {
+                    'messaging_product': 'whatsapp',
+                    'recipient_type': 'individual',
+                    'type': 'image',
+                    'image': {'link': photo_url, 'caption': message_content}
+                }
+                recipient_ids = target_digits
+            else:
+                # Text-only message
+                base_payload = {
+                    'messaging_product': 'whatsapp',
+                    'recipient_type': 'individual',
+                    'type': 'text',
+                    'text': {'preview_url': True, 'body': message_content}
+                }
+                recipient_ids = target_numbers
+            
+            # Send to all recipients concurrently
+            futures = []
+            for i, (target_number, recipient_id) in enumerate(zip(target_numbers, recipient_ids), 1):
+                if debug_enabled:
+                    self.logger.debug("Sending to recipient %d/%d: %s", i, total_recipients, target_number)
+                futures.append(self._executor.submit(
+                    self._send_one, target_number, {**base_payload, 'to': recipient_id}
+                ))
+            
+        except Exception as e:
+            return {'result': self._batch_error(attendance_data, total_recipients, e)}
+        
+        job = {
+            'attendance_data': attendance_data,
+            'total_recipients': total_recipients,
+            'photo_url': photo_url,
+            'dedup_key': dedup_key,
+            'futures': futures
+        }
+        if pending is not None and dedup_key is not None:
+            pending[dedup_key] = job
+        return job
+    
+    def _collect(self, job: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Wait for a dispatched job and build its batch summary.
+        
+        Args:
+            job: Job dictionary returned by _dispatch()
+        
+        Returns:
+            Tuple of (overall_success_status, detailed_response_data)
+        """
+        if 'result' in job:
+            return job['result']
+        
+        if 'duplicate_of' in job:
+            overall_success, response_data = self._collect(job['duplicate_of'])
+            if overall_success:
+                response_data = dict(response_data, deduplicated=True)
+            return overall_success, response_data
+        
+        attendance_data = job['attendance_data']
+        total_recipients = job['total_recipients']
+        photo_url = job['photo_url']
+        
+        try:
+            successful_sends = []
+            failed_sends = []
+            
+            # WHY: Results are collected in submission order so the reported
+            # numbers keep the recipient list order
+            for future in job['futures']:
+                sent, result = future.result()
+                if sent:
+                    successful_sends.append(result)
+                else:
+                    failed_sends.append(result)
             
             # Calculate success metrics
             success_count = len(successful_sends)
@@ -200,8 +545,8 @@ class WhatsAppService:
             # Log summary
             image_status = "with image" if photo_url else "text only"
             self.logger.info(
-                f"Batch send completed ({image_status}) for {attendance_data['nombre']}: "
-                f"{success_count}/{total_recipients} successful ({success_rate:.1f}%)"
+                "Batch send completed (%s) for %s: %d/%d successful (%.1f%%)",
+                image_status, attendance_data['nombre'], success_count, total_recipients, success_rate
             )
             
             # Prepare detailed response
@@ -218,30 +563,291 @@ class WhatsAppService:
                 'photo_url': photo_url if photo_url else None
             }
             
-            return overall_success, response_data
+            if overall_success and job['dedup_key'] is not None:
+                self._dedup_store(job['dedup_key'], response_data)
+            
+            job['result'] = (overall_success, response_data)
                 
         except Exception as e:
-            self.logger.error(
-                f"Critical error in batch send for {attendance_data.get('nombre', 'unknown')}: {e}. "
-                f"Data: {attendance_data}"
-            )
+            job['result'] = self._batch_error(attendance_data, total_recipients, e)
+        
+        return job['result']
+    
+    def _batch_error(
+        self,
+        attendance_data: Dict[str, str],
+        total_recipients: int,
+        error: Exception
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """Log a failed notification and build its error response."""
+        self.logger.error(
+            "Critical error in batch send for %s: %s. Data: %s",
+            attendance_data.get('nombre', 'unknown'), error, attendance_data
+        )
+        return False, {
+            "error": str(error),
+            "batch_summary": {
+                "total_recipients": total_recipients,
+                "successful_sends": 0,
+                "failed_sends": 0,
+                "success_rate": 0
+            }
+        }
+    
+    def _send_one(
+        self,
+        target_number: str,
+        payload: Dict[str, Any]
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Send the notification to a single recipient.
+        
+        Args:
+            target_number: Recipient number as configured (for reporting)
+            payload: Complete message object addressed to the recipient
+        
+        Returns:
+            Tuple of (sent, send_record) where send_record is
+            {'number', 'message_id'} on success or {'number', 'error'}
+        """
+        # WHY: While the Graph API is failing, skip the call entirely
+        if not self._breaker.allow_request():
             return False, {
-                "error": str(e),
-                "batch_summary": {
-                    "total_recipients": len(target_numbers) if 'target_numbers' in locals() else 0,
-                    "successful_sends": 0,
-                    "failed_sends": 0,
-                    "success_rate": 0
+                'number': target_number,
+                'error': 'circuit_open'
+            }
+        
+        try:
+            # WHY: Any exception must report back, otherwise a half-open
+            # probe that raises leaves the circuit half-open for good
+            try:
+                http_response = self._post_with_retry(target_number, payload)
+            except Exception:
+                self._breaker.record_failure()
+                raise
+            
+            # WHY: Only transport errors, 429 and 5xx count against the API;
+            # other 4xx (e.g. invalid recipient) mean the API is reachable
+            if http_response.status_code in _RETRYABLE_STATUS_CODES:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+            
+            response = orjson.loads(http_response.content)
+            
+            # Check if send was successful
+            # WHY: Only compact records are kept for the batch summary; the
+            # full Graph API response goes to the debug log
+            self.logger.debug("Graph API response for %s: %s", target_number, response)
+            
+            if response and 'messages' in response:
+                message_id = response.get('messages', [{}])[0].get('id', 'unknown')
+                self.logger.debug("Successfully sent to %s (ID: %s)", target_number, message_id)
+                return True, {
+                    'number': target_number,
+                    'message_id': message_id
                 }
+            
+            self.logger.warning("Failed to send to %s: Invalid response", target_number)
+            return False, {
+                'number': target_number,
+                'error': f"Invalid response: {response}"
+            }
+            
+        except Exception as send_error:
+            self.logger.error("Error sending to %s: %s", target_number, send_error)
+            return False, {
+                'number': target_number,
+                'error': str(send_error)
             }
     
-    def validate_attendance_data(self, data: Dict[str, Any]) -> Tuple[bool, str]:
+    def _dedup_key(
+        self,
+        attendance_data: Dict[str, str],
+        target_numbers: List[str]
+    ) -> Optional[tuple]:
+        """
+        Build the deduplication signature for an attendance event.
+        
+        Returns:
+            Hashable key, or None when deduplication does not apply
+        """
+        if self._dedup_ttl <= 0:
+            return None
+        try:
+            return (
+                attendance_data['nombre'],
+                attendance_data['empresa'],
+                attendance_data['fecha_hora'],
+                attendance_data.get('photo'),
+                tuple(target_numbers)
+            )
+        except (KeyError, TypeError):
+            return None
+    
+    def _dedup_lookup(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return the stored result for key if it has not expired."""
+        now = time.monotonic()
+        with self._dedup_lock:
+            entry = self._dedup.get(key)
+            if entry is None:
+                return None
+            stored_at, response_data = entry
+            if now - stored_at > self._dedup_ttl:
+                del self._dedup[key]
+                return None
+        return dict(response_data, deduplicated=True)
+    
+    def _dedup_store(self, key: tuple, response_data: Dict[str, Any]) -> None:
+        """Remember a successful result, evicting the oldest entries when full."""
+        with self._dedup_lock:
+            self._dedup[key] = (time.monotonic(), response_data)
+            self._dedup.move_to_end(key)
+            while len(self._dedup) > self._dedup_size:
+                self._dedup.popitem(last=False)
+    
+    def _post_with_retry(self, target_number: str, payload: Dict[str, Any]) -> requests.Response:
+        """
+        POST a message, retrying transient failures with backoff.
+        
+        Args:
+            target_number: Recipient number (for logging)
+            payload: WhatsApp Cloud API message object
+        
+        Returns:
+            Final Graph API response (error responses included)
+        
+        Raises:
+            requests.ConnectionError, requests.Timeout: When retries are exhausted
+            
+        WHY: Timeouts, connection errors, 429 and 5xx are transient on the
+        Graph API; other 4xx responses are returned immediately. The
+        in-flight slot is released while waiting between attempts
+        """
+        bucket = self._media_bucket if payload['type'] == 'image' else self._text_bucket
+        
+        # WHY: Without a pinned API version the URL comes from building the
+        # client (two untimed HTTP lookups); that happens before the pacing
+        # wait and in-flight slot so it never holds a slot
+        url = self._messages_url
+        if url is None:
+            url = self._messages_url = self.messenger.url
+        
+        attempt = 0
+        while True:
+            # WHY: Pacing wait happens before taking an in-flight slot
+            if bucket is not None:
+                bucket.acquire()
+            try:
+                with self._in_flight:
+                    started = time.monotonic()
+                    response = self._post_message(url, payload)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # WHY: Elapsed time on timeouts is what the timeouts are tuned from
+                if isinstance(e, requests.Timeout):
+                    self.logger.warning(
+                        "Graph API request to %s timed out after %.2fs",
+                        target_number, time.monotonic() - started
+                    )
+                if attempt >= self._max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                reason = str(e)
+            else:
+                if response.status_code not in _RETRYABLE_STATUS_CODES or attempt >= self._max_retries:
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                reason = f"HTTP {response.status_code}"
+            
+            attempt += 1
+            self.logger.warning(
+                "Retrying send to %s in %.2fs (attempt %d/%d): %s",
+                target_number, delay, attempt, self._max_retries, reason
+            )
+            time.sleep(delay)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff delay for a retry attempt, with up to 50% jitter."""
+        return min(self._retry_cap, self._retry_base * (2 ** attempt) * (1 + random.random() * 0.5))
+    
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Delay requested by a Retry-After header in seconds, capped; None if absent."""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is None:
+            return None
+        try:
+            return min(self._retry_cap, max(0.0, float(retry_after)))
+        except ValueError:
+            return None
+    
+    def _post_message(self, url: str, payload: Dict[str, Any]) -> requests.Response:
+        """
+        POST a message payload to the Graph API messages endpoint.
+        
+        Args:
+            url: Graph API messages endpoint
+            payload: WhatsApp Cloud API message object
+        
+        Returns:
+            Raw Graph API response
+            
+        WHY: Sent through the service's pooled session (which carries the
+        auth and JSON content-type headers) rather than the library's
+        per-call requests.post(); the body is pre-encoded with orjson and
+        the (connect, read) timeout bounds a hung socket
+        """
+        return self._http.post(url, data=orjson.dumps(payload), timeout=self._timeout)
+    
+    def close(self) -> None:
+        """
+        Release the send thread pool and pooled HTTP connections.
+        
+        WHY: Called on application shutdown after the notification queue
+        has drained, so in-progress sends finish before sockets close
+        """
+        self._executor.shutdown(wait=True)
+        self._http.close()
+    
+    def send_batch(
+        self,
+        batch: List[Dict[str, str]]
+    ) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        Send notifications for several attendance events.
+        
+        Args:
+            batch: List of validated attendance data dictionaries
+        
+        Returns:
+            List of (success, response_data) tuples in batch order
+            
+        WHY: Queue workers hand over accumulated events in one call so
+        delivery of a burst shares the same sending resources
+        """
+        self.logger.debug("Sending batch of %d attendance notifications", len(batch))
+        
+        # WHY: Every recipient of every event is on the pool before the
+        # first result is awaited, so a burst shares one fan-out instead of
+        # running event after event
+        pending: Dict[tuple, Dict[str, Any]] = {}
+        jobs = [self._dispatch(attendance_data, pending=pending) for attendance_data in batch]
+        return [self._collect(job) for job in jobs]
+    
+    def validate_attendance_data(
+        self,
+        data: Dict[str, Any],
+        payload: Optional[AttendancePayload] = None
+    ) -> Tuple[bool, str]:
         """
         Validate attendance data format and content.
         
         Args:
             data: Raw attendance data to validate
                  - Can include optional 'photo' field with image URL
+            payload: data already decoded into AttendancePayload (e.g. by
+                    the webhook decoder); its schema check is not repeated
             
         Returns:
             Tuple of (is_valid, error_message)
@@ -249,72 +855,22 @@ class WhatsAppService:
         WHY: Input validation prevents errors and ensures data quality
         before processing and message sending. Now includes photo validation.
         """
+        if not isinstance(data, dict):
+            return False, "Attendance data must be a dictionary"
+        
         try:
-            # Check required fields
-            required_fields = ['nombre', 'empresa', 'cargo', 'fecha_hora']
-            optional_fields = ['photo']  # New optional field
-            
-            if not isinstance(data, dict):
-                return False, "Attendance data must be a dictionary"
-            
-            missing_fields = []
-            empty_fields = []
-            
-            for field in required_fields:
-                if field not in data:
-                    missing_fields.append(field)
-                elif not data[field] or str(data[field]).strip() == '':
-                    empty_fields.append(field)
-            
-            if missing_fields:
-                return False, f"Missing required fields: {', '.join(missing_fields)}"
-            
-            if empty_fields:
-                return False, f"Empty required fields: {', '.join(empty_fields)}"
-            
-            # WHY: Validate date format if it's a string
-            fecha_hora = data['fecha_hora']
-            if isinstance(fecha_hora, str):
-                try:
-                    # Try to parse common date formats
-                    datetime.strptime(fecha_hora, '%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    try:
-                        datetime.strptime(fecha_hora, '%d/%m/%Y %H:%M')
-                    except ValueError:
-                        return False, "Invalid date format. Expected 'YYYY-MM-DD HH:MM:SS' or 'DD/MM/YYYY HH:MM'"
-            
-            # WHY: Validate field lengths to prevent message truncation
-            max_lengths = {
-                'nombre': 100,
-                'empresa': 100,
-                'cargo': 100
-            }
-            
-            for field, max_length in max_lengths.items():
-                if len(str(data[field])) > max_length:
-                    return False, f"Field '{field}' exceeds maximum length of {max_length} characters"
+            if payload is not None:
+                return _validate_payload(payload, data)
             
-            # WHY: Validate photo URL if provided
-            if 'photo' in data and data['photo']:
-                photo_url = str(data['photo']).strip()
-                if not photo_url.startswith(('http://', 'https://')):
-                    return False, "Photo field must be a valid URL starting with http:// or https://"
-                
-                # Basic URL validation
-                if len(photo_url) > 2000:
-                    return False, "Photo URL exceeds maximum length of 2000 characters"
-                
-                # Optional: Validate image file extensions
-                valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
-                if not any(photo_url.lower().endswith(ext) for ext in valid_extensions):
-                    # Allow URLs without extensions (some services don't show extensions)
-                    self.logger.warning(f"Photo URL doesn't have a common image extension: {photo_url}")
-            
-            return True, "Valid"
+            # WHY: Webhook retries resend identical payloads; all-string
+            # payloads are hashable as sorted items and hit the LRU, anything
+            # else (numbers, nested values) is validated uncached
+            if all(value is None or isinstance(value, str) for value in data.values()):
+                return _validate_cached(tuple(sorted(data.items())))
+            return _validate_fields(data)
             
         except Exception as e:
-            self.logger.error(f"Error validating attendance data: {e}")
+            self.logger.error("Error validating attendance data: %s", e)
             return False, f"Validation error: {str(e)}"
     
     def get_service_status(self) -> Dict[str, Any]:
@@ -327,16 +883,7 @@ class WhatsAppService:
         WHY: Provides diagnostic information for monitoring
         and troubleshooting service health
         """
-        return {
-            'service': 'WhatsApp Attendance Notifier',
-            'status': 'active',
-            'phone_number_id': list(self.config['phone_number_id'].values())[0],
-            'recipient_count': len(self.recipient_numbers),
-            'recipient_numbers': [num[-4:].rjust(4, '*') + num[-4:] for num in self.recipient_numbers],  # Masked numbers
-            'debug_mode': self.config.get('debug', False),
-            'logger_enabled': self.config.get('logger', True),
-            'timestamp': datetime.now().isoformat()
-        }
+        return {**self._status_base, 'circuit_breaker': self._breaker.state, 'timestamp': now_iso()}
 
 
 class WhatsAppServiceError(Exception):
@@ -346,4 +893,139 @@ class WhatsAppServiceError(Exception):
     WHY: Specific exception type allows for better error handling
     and distinguishes service errors from other application errors
     """
-    pass
\ No newline at end of file
+    pass
+
+
+def _is_valid_fecha_hora(value: str) -> bool:
+    """
+    Check fecha_hora matches an accepted format and is a real date/time.
+    
+    WHY: One precompiled match picks the format; building the datetime from
+    the captured fields validates the calendar without strptime re-parsing
+    format strings or raising once per rejected format
+    """
+    match = _FECHA_HORA_RE.fullmatch(value)
+    if match is None:
+        return False
+    
+    if match.group('y1') is not None:
+        fields = match.group('y1', 'm1', 'd1', 'H1', 'M1', 'S1')
+    else:
+        fields = match.group('y2', 'm2', 'd2', 'H2', 'M2')
+    
+    try:
+        datetime(*map(int, fields))
+    except ValueError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=512)
+def _validate_cached(frozen_items: Tuple[Tuple[str, Any], ...]) -> Tuple[bool, str]:
+    """Memoized _validate_fields for payloads frozen into sorted item tuples."""
+    return _validate_fields(dict(frozen_items))
+
+
+def _validate_fields(data: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Validate attendance fields (pure function of the payload).
+    
+    Args:
+        data: Attendance data dictionary
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+        
+    WHY: Well-formed payloads pass msgspec's schema check and only need the
+    date and photo post-validators; anything the schema rejects goes through
+    the field-by-field checks, which name the offending field and still
+    accept legacy non-string values
+    """
+    try:
+        payload = msgspec.convert(data, AttendancePayload)
+    except msgspec.ValidationError:
+        return _validate_fields_detailed(data)
+    
+    return _validate_payload(payload, data)
+
+
+def _validate_payload(payload: AttendancePayload, data: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Validate attendance data that already passed the AttendancePayload schema.
+    
+    Args:
+        payload: Schema-checked attendance data
+        data: The same data as a dictionary (for detailed error reporting)
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not (
+        payload.nombre.strip() and payload.empresa.strip()
+        and payload.cargo.strip() and payload.fecha_hora.strip()
+    ):
+        return _validate_fields_detailed(data)
+    
+    return _validate_values(payload.fecha_hora, payload.photo)
+
+
+def _validate_fields_detailed(data: Dict[str, Any]) -> Tuple[bool, str]:
+    """Field-by-field validation reporting the first documented error."""
+    # Check required fields
+    # WHY: One C-level subset test on the happy path; the ordered list of
+    # missing names is only built when something is absent
+    if not _REQUIRED_FIELD_SET <= data.keys():
+        missing_fields = [field for field in _REQUIRED_FIELDS if field not in data]
+        return False, f"Missing required fields: {', '.join(missing_fields)}"
+    
+    empty_fields = [
+        field for field in _REQUIRED_FIELDS
+        if not data[field] or str(data[field]).strip() == ''
+    ]
+    if empty_fields:
+        return False, f"Empty required fields: {', '.join(empty_fields)}"
+    
+    # WHY: Validate date format if it's a string
+    fecha_hora = data['fecha_hora']
+    if isinstance(fecha_hora, str) and not _is_valid_fecha_hora(fecha_hora):
+        return False, "Invalid date format. Expected 'YYYY-MM-DD HH:MM:SS' or 'DD/MM/YYYY HH:MM'"
+    
+    # WHY: Validate field lengths to prevent message truncation
+    for field, max_length in _MAX_LENGTHS.items():
+        if len(str(data[field])) > max_length:
+            return False, f"Field '{field}' exceeds maximum length of {max_length} characters"
+    
+    return _validate_values(None, data.get('photo'))
+
+
+def _validate_values(fecha_hora: Optional[str], photo: Any) -> Tuple[bool, str]:
+    """
+    Post-validate the date format and the optional photo URL.
+    
+    Args:
+        fecha_hora: Date string to check, or None when already checked
+        photo: Optional photo URL
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if fecha_hora is not None and not _is_valid_fecha_hora(fecha_hora):
+        return False, "Invalid date format. Expected 'YYYY-MM-DD HH:MM:SS' or 'DD/MM/YYYY HH:MM'"
+    
+    # WHY: Validate photo URL if provided
+    if photo:
+        # WHY: strip() and startswith() are linear; a single regex spanning
+        # the surrounding whitespace backtracked quadratically on padded URLs
+        photo_url = (photo if isinstance(photo, str) else str(photo)).strip()
+        if not photo_url.startswith(('http://', 'https://')):
+            return False, "Photo field must be a valid URL starting with http:// or https://"
+        
+        # Basic URL validation
+        if len(photo_url) > _PHOTO_URL_MAX_LENGTH:
+            return False, f"Photo URL exceeds maximum length of {_PHOTO_URL_MAX_LENGTH} characters"
+        
+        if _PHOTO_EXT_RE.search(photo_url) is None:
+            # Allow URLs without extensions (some services don't show extensions)
+            logger.warning("Photo URL doesn't have a common image extension: %s", photo_url)
+    
+    return True, "Valid"
\ No newline at end of file
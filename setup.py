@@ -6,7 +6,7 @@ This script helps with initial setup, environment validation,
 and basic configuration checks.
 """
 
-import os
+import re
 import sys
 import subprocess
 from pathlib import Path
@@ -23,18 +23,15 @@ def check_python_version():
 
 
 def check_whatsapp_python_library():
-    """Check if whatsapp-python library is accessible."""
+    """Check if whatsapp-python library is installed."""
     try:
-        # Add whatsapp-python to path
-        whatsapp_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'whatsapp-python')
-        sys.path.insert(0, whatsapp_path)
-        
         import whatsapp
         print("✅ whatsapp-python library found")
         return True
     except ImportError:
         print("❌ Error: whatsapp-python library not found")
-        print("   Make sure the whatsapp-python directory exists in the parent directory")
+        print("   Install it with: pip install -r requirements.txt")
+        print("   (or pip install -e ../whatsapp-python for a local checkout)")
         return False
 
 
@@ -73,13 +70,16 @@ def check_env_file():
         'WHATSAPP_RECIPIENT_NUMBER'
     ]
     
-    with open('.env', 'r') as f:
+    with open('.env', 'r', encoding='utf-8') as f:
         env_content = f.read()
     
-    missing_vars = []
-    for var in required_vars:
-        if f"{var}=" not in env_content or f"{var}=your_" in env_content or f"{var}=" in env_content.replace(f"{var}=\n", f"{var}="):
-            missing_vars.append(var)
+    # WHY: One pass collects every uncommented assignment; a variable is
+    # missing when unset, empty or still holding a 'your_' placeholder
+    assignments = dict(re.findall(r'^([A-Z_][A-Z0-9_]*)=(.*?)\s*$', env_content, re.M))
+    missing_vars = [
+        var for var in required_vars
+        if not assignments.get(var) or assignments[var].startswith('your_')
+    ]
     
     if missing_vars:
         print(f"⚠️  .env file found but missing/incomplete variables: {', '.join(missing_vars)}")
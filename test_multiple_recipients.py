@@ -10,6 +10,16 @@ import json
 import requests
 import sys
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# WHY: One keep-alive session for every request the script makes; transient
+# 502/503/504 on idempotent calls (health checks) are retried like in
+# production, while webhook POSTs are sent once
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504]))
+SESSION.mount('http://', _ADAPTER)
+SESSION.mount('https://', _ADAPTER)
 
 def test_multiple_recipients():
     """Test the multiple recipients functionality."""
@@ -36,7 +46,7 @@ def test_multiple_recipients():
     
     try:
         print("📡 Sending POST request to webhook...")
-        response = requests.post(
+        response = SESSION.post(
             url,
             json=test_data,
             headers={'Content-Type': 'application/json'},
@@ -45,7 +55,14 @@ def test_multiple_recipients():
         
         print(f"📋 Response Status: {response.status_code}")
         
-        if response.status_code == 200:
+        if response.status_code == 202:
+            # WHY: Delivery runs on background workers; batch results are logged by the server
+            response_data = response.json()
+            print("✅ SUCCESS - Notification queued for delivery!")
+            print(f"   {response_data.get('message', '')}")
+            print("   Batch results are reported in the server logs.")
+            
+        elif response.status_code == 200:
             response_data = response.json()
             print("✅ SUCCESS - Webhook processed successfully!")
             print()
@@ -103,7 +120,7 @@ def test_health_check():
     print("="*30)
     
     try:
-        response = requests.get("http://127.0.0.1:7000/health", timeout=10)
+        response = SESSION.get("http://127.0.0.1:7000/health", timeout=10)
         
         if response.status_code == 200:
             health_data = response.json()
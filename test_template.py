@@ -11,11 +11,21 @@ Usage:
 
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 BASE_URL = "http://localhost:5000"
 WEBHOOK_URL = f"{BASE_URL}/attendance-webhook"
 
+# WHY: One keep-alive session for every request the script makes; transient
+# 502/503/504 on idempotent calls (health checks) are retried like in
+# production, while webhook POSTs are sent once
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504]))
+SESSION.mount('http://', _ADAPTER)
+SESSION.mount('https://', _ADAPTER)
+
 def test_basic_notification():
     """Test basic attendance notification without photo."""
     data = {
@@ -26,7 +36,7 @@ def test_basic_notification():
     }
     
     print("Testing basic notification (no photo)...")
-    response = requests.post(WEBHOOK_URL, json=data)
+    response = SESSION.post(WEBHOOK_URL, json=data)
     
     print(f"Status: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
@@ -43,7 +53,7 @@ def test_notification_with_photo():
     }
     
     print("Testing notification with photo...")
-    response = requests.post(WEBHOOK_URL, json=data)
+    response = SESSION.post(WEBHOOK_URL, json=data)
     
     print(f"Status: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
@@ -60,7 +70,7 @@ def test_invalid_photo_url():
     }
     
     print("Testing invalid photo URL...")
-    response = requests.post(WEBHOOK_URL, json=data)
+    response = SESSION.post(WEBHOOK_URL, json=data)
     
     print(f"Status: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
@@ -73,7 +83,7 @@ def main():
     
     try:
         # Test health endpoint first
-        health_response = requests.get(f"{BASE_URL}/health")
+        health_response = SESSION.get(f"{BASE_URL}/health")
         if health_response.status_code == 200:
             print("Service is healthy")
             print("-" * 50)
@@ -0,0 +1,75 @@
+"""
+Locust Load Test for the Attendance Webhook.
+
+Each simulated user posts fresh fictional attendance records to the
+webhook endpoint; the Locust web UI (or --headless) reports throughput,
+latency percentiles and failures.
+
+Usage:
+    locust -f tests/locustfile.py --host http://localhost:5000 -u 500 -r 50
+    locust -f tests/locustfile.py --host http://localhost:5000 --exclude-tags errors
+    locust -f tests/locustfile.py --host http://localhost:5000 --tags errors
+
+WHY: The serial tester measures one request at a time; Locust drives many
+concurrent users per process (and across workers) to load-test the
+endpoint itself.
+"""
+
+from typing import Dict
+
+import orjson
+from locust import FastHttpUser, between, tag, task
+
+from test_webhook import generate_attendance_records
+
+
+# Payload the webhook must reject (missing 'nombre'), encoded once
+_INVALID_BODY = orjson.dumps({
+    'empresa': 'Test Company',
+    'cargo': 'Test Position',
+    'fecha_hora': '2023-01-01 10:00:00'
+})
+
+# Bodies are sent pre-encoded with orjson
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+class AttendanceUser(FastHttpUser):
+    """
+    Virtual user posting attendance notifications.
+    
+    WHY: FastHttpUser (geventhttpclient) sustains more requests per core
+    than the requests-based HttpUser
+    """
+    
+    wait_time = between(1, 5)
+    
+    def _random_record(self) -> Dict[str, str]:
+        """Draw one fresh fictional attendance record."""
+        return generate_attendance_records(1)[0]
+    
+    @task(10)
+    def post_attendance(self) -> None:
+        """Send a valid notification (200 or 202 counts as success)."""
+        self.client.post(
+            "/attendance-webhook",
+            data=orjson.dumps(self._random_record()),
+            headers=_JSON_HEADERS,
+            name="/attendance-webhook"
+        )
+    
+    @tag("errors")
+    @task(1)
+    def post_invalid_attendance(self) -> None:
+        """Send invalid data; only a 400 rejection counts as success."""
+        with self.client.post(
+            "/attendance-webhook",
+            data=_INVALID_BODY,
+            headers=_JSON_HEADERS,
+            name="/attendance-webhook [invalid]",
+            catch_response=True
+        ) as response:
+            if response.status_code == 400:
+                response.success()
+            else:
+                response.failure(f"Expected 400, got {response.status_code}")
\ No newline at end of file
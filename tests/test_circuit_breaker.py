@@ -0,0 +1,64 @@
+"""
+Tests for the Graph API circuit breaker.
+
+WHY: A half-open probe that never reports back would keep every send
+failing with circuit_open until the process restarts.
+"""
+
+import time
+
+from config import TestingConfig
+from services.circuit_breaker import CircuitBreaker
+from services.whatsapp_service import WhatsAppService
+
+
+def _open_breaker(reset_timeout: float) -> CircuitBreaker:
+    """Breaker opened by one failure."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    return breaker
+
+
+def test_half_open_allows_single_probe():
+    breaker = _open_breaker(reset_timeout=0.05)
+    assert not breaker.allow_request()
+    
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+    
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_abandoned_probe_is_replaced_after_reset_timeout():
+    breaker = _open_breaker(reset_timeout=0.05)
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    
+    # WHY: The first probe never reports back
+    time.sleep(0.06)
+    assert breaker.allow_request()
+
+
+def test_probe_raising_non_request_error_reopens_circuit(monkeypatch):
+    config = TestingConfig.get_whatsapp_config()
+    config.update(breaker_failures=1, breaker_reset=0.05)
+    service = WhatsAppService(config)
+    try:
+        def _raise(*args, **kwargs):
+            raise RuntimeError("client construction failed")
+        monkeypatch.setattr(service, '_post_with_retry', _raise)
+        
+        service._breaker.record_failure()
+        time.sleep(0.06)
+        
+        sent, record = service._send_one('+1234567890', {})
+        assert not sent
+        assert record['error'] == 'client construction failed'
+        assert service._breaker.state == CircuitBreaker.OPEN
+    finally:
+        service._executor.shutdown(wait=False)
\ No newline at end of file
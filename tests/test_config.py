@@ -0,0 +1,54 @@
+"""
+Tests for recipient number loading and caching in config.
+"""
+
+import pytest
+
+from config import Config, get_config
+
+
+@pytest.fixture
+def phone_file(tmp_path, monkeypatch):
+    """Point every config class at a temporary phone numbers file."""
+    path = tmp_path / 'phone_numbers.txt'
+    monkeypatch.setattr(Config, 'PHONE_NUMBERS_FILE', str(path))
+    monkeypatch.setattr(Config, 'WHATSAPP_RECIPIENT_NUMBER', None)
+    Config.invalidate_recipients()
+    yield path
+    Config.invalidate_recipients()
+
+
+def test_invalidate_recipients_reaches_active_config(phone_file):
+    config = get_config('development')
+    
+    phone_file.write_bytes(b'51999999999\n')
+    assert config.get_recipient_numbers() == ('+51999999999',)
+    
+    phone_file.write_bytes(b'51999999999\n51988888888\n')
+    assert config.get_recipient_numbers() == ('+51999999999',)
+    
+    Config.invalidate_recipients()
+    assert config.get_recipient_numbers() == ('+51999999999', '+51988888888')
+
+
+@pytest.mark.parametrize('content', [
+    b'51999999999\x0c\n51988888888\n',
+    b'\x0b51999999999\n51988888888\x0b\n',
+    b'51999999999\r51988888888\n',
+])
+def test_recipient_lines_with_other_whitespace_are_kept(phone_file, content):
+    phone_file.write_bytes(content)
+    assert Config.get_recipient_numbers() == ('+51999999999', '+51988888888')
+
+
+def test_invalid_recipient_line_is_reported(phone_file):
+    phone_file.write_bytes(b'51999999999\n# comment\n5199999\n')
+    with pytest.raises(ValueError, match='line 3'):
+        Config.get_recipient_numbers()
+
+
+@pytest.mark.parametrize('line', [b'51' + b'\x00' * 9, b'51 99999999', b'5199999999a'])
+def test_non_digit_recipient_line_is_reported(phone_file, line):
+    phone_file.write_bytes(b'51999999999\n' + line + b'\n')
+    with pytest.raises(ValueError, match='line 2'):
+        Config.get_recipient_numbers()
\ No newline at end of file
@@ -7,21 +7,124 @@ POST requests to the webhook endpoint with fictional employee data.
 Useful for testing and demonstration purposes.
 
 Usage:
-    python test_webhook.py [--host localhost] [--port 5000] [--count 5]
+    python test_webhook.py [--host localhost] [--port 5000] [--count 5] [--concurrency 1]
+                           [--results-file results.jsonl] [--rate 10]
 
 WHY: Automated testing with realistic data helps validate the complete
 notification workflow and provides examples for integration.
 """
 
-import json
+import asyncio
+import statistics
 import sys
 import time
 import argparse
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from collections import deque
+from typing import List, Dict, Any, Optional, BinaryIO
 import random
 
+# Latency samples kept for the percentile summary (most recent requests)
+_LATENCY_SAMPLES = 10_000
+
+
+# Fictional employee data (immutable, shared by every caller and thread)
+_NOMBRES = (
+    "Ana García López", "Carlos Rodríguez Martín", "María José Fernández",
+    "Pedro Antonio Silva", "Isabel Morales Castro", "Jorge Luis Vega",
+    "Carmen Elena Ruiz", "Fernando José Díaz", "Patricia Hernández",
+    "Ricardo Andrés Torres", "Sofía Alejandra Reyes", "Miguel Ángel Ramos",
+    "Lucía Beatriz Jiménez", "Alejandro David Castro", "Natalia Cristina Vargas"
+)
+
+_EMPRESAS = (
+    "TechSolutions S.A.", "Innovación Digital Ltda.", "Consultoría Empresarial Pro",
+    "Desarrollo Software Corp", "Servicios Integrales Plus", "Tecnología Avanzada S.R.L.",
+    "Sistemas Corporativos", "Global Business Solutions", "Automatización Industrial",
+    "Gestión Moderna S.A.", "Ingeniería y Desarrollo", "Soluciones Tecnológicas 360"
+)
+
+_CARGOS = (
+    "Desarrollador Senior", "Analista de Sistemas", "Gerente de Proyectos",
+    "Arquitecto de Software", "Especialista en DevOps", "Líder Técnico",
+    "Consultor Senior", "Ingeniero de Datos", "Product Owner",
+    "Scrum Master", "Analista de Negocio", "Coordinador de TI",
+    "Especialista en Seguridad", "Administrador de Sistemas", "QA Engineer"
+)
+
+# Sample photo URLs for testing
+_PHOTO_URLS = (
+    "https://iaap.org/wp-content/uploads/2022/11/Image_001-8.jpg",
+    "https://images.unsplash.com/photo-1560250097-0b93528c311a?w=400",
+    "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=400",
+    "https://images.unsplash.com/photo-1494790108755-2616b2e9b863?w=400",
+    "https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?w=400",
+    None,  # Some records without photos
+    None,
+    "https://images.unsplash.com/photo-1519085360753-af0119f7cbe7?w=400"
+)
+
+# WHY: Filtered once at import rather than on every call
+_PHOTO_URLS_PRESENT = tuple(url for url in _PHOTO_URLS if url is not None)
+
+# Attendance times are drawn within the last hour, per minute
+_MINUTE_OFFSETS = tuple(range(61))
+
+
+def generate_attendance_records(count: int = 5) -> List[Dict[str, str]]:
+    """
+    Generate fictional attendance data for testing.
+    
+    Args:
+        count: Number of test records to generate
+        
+    Returns:
+        List of attendance data dictionaries
+        
+    WHY: Realistic test data helps validate formatting and
+    ensures the system handles various input scenarios; module-level so
+    the Locust load test (tests/locustfile.py) draws from the same data
+    """
+    
+    # WHY: Each field is drawn for all records in one bulk random.choices
+    # call; each distinct minute offset (last hour) is formatted once, so
+    # small calls (one record per Locust task) format a single timestamp
+    base_time = datetime.now()
+    timestamps = {}
+    
+    test_data = []
+    for nombre, empresa, cargo, minutes, photo_url, photo_roll in zip(
+        random.choices(_NOMBRES, k=count),
+        random.choices(_EMPRESAS, k=count),
+        random.choices(_CARGOS, k=count),
+        random.choices(_MINUTE_OFFSETS, k=count),
+        random.choices(_PHOTO_URLS_PRESENT, k=count),
+        [random.random() for _ in range(count)]
+    ):
+        fecha_hora = timestamps.get(minutes)
+        if fecha_hora is None:
+            fecha_hora = timestamps[minutes] = (base_time - timedelta(minutes=minutes)).strftime("%Y-%m-%d %H:%M:%S")
+        
+        record = {
+            "nombre": nombre,
+            "empresa": empresa,
+            "cargo": cargo,
+            "fecha_hora": fecha_hora
+        }
+        
+        # Add photo to some records (60% chance)
+        if photo_roll < 0.6:
+            record["photo"] = photo_url
+        
+        test_data.append(record)
+        
+    return test_data
+
 
 class AttendanceWebhookTester:
     """
@@ -31,17 +134,43 @@ class AttendanceWebhookTester:
     endpoint to validate functionality.
     """
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, concurrency: int = 1):
         """
         Initialize test client.
         
         Args:
             base_url: Base URL of the Flask application
+            concurrency: Expected simultaneous requests (sizes the connection pool)
         """
         self.base_url = base_url.rstrip('/')
         self.webhook_url = f"{self.base_url}/attendance-webhook"
         self.health_url = f"{self.base_url}/health"
         
+        # WHY: One keep-alive session reuses the TCP connection across every
+        # request instead of a new handshake per call; connection errors
+        # and idempotent requests are retried briefly
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'User-Agent': 'AttendanceWebhookTester/1.0'
+        })
+        # WHY: Pool sized to the concurrency so concurrent callers never find
+        # it full; pool_block waits for a free connection instead of opening
+        # and discarding extra ones
+        pool_size = max(concurrency, 32)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        self.session.close()
+        
     def generate_test_data(self, count: int = 5) -> List[Dict[str, str]]:
         """
         Generate fictional attendance data for testing.
@@ -51,70 +180,8 @@ class AttendanceWebhookTester:
             
         Returns:
             List of attendance data dictionaries
-            
-        WHY: Realistic test data helps validate formatting and
-        ensures the system handles various input scenarios
         """
-        
-        # Fictional employee data
-        nombres = [
-            "Ana García López", "Carlos Rodríguez Martín", "María José Fernández",
-            "Pedro Antonio Silva", "Isabel Morales Castro", "Jorge Luis Vega",
-            "Carmen Elena Ruiz", "Fernando José Díaz", "Patricia Hernández",
-            "Ricardo Andrés Torres", "Sofía Alejandra Reyes", "Miguel Ángel Ramos",
-            "Lucía Beatriz Jiménez", "Alejandro David Castro", "Natalia Cristina Vargas"
-        ]
-        
-        empresas = [
-            "TechSolutions S.A.", "Innovación Digital Ltda.", "Consultoría Empresarial Pro",
-            "Desarrollo Software Corp", "Servicios Integrales Plus", "Tecnología Avanzada S.R.L.",
-            "Sistemas Corporativos", "Global Business Solutions", "Automatización Industrial",
-            "Gestión Moderna S.A.", "Ingeniería y Desarrollo", "Soluciones Tecnológicas 360"
-        ]
-        
-        cargos = [
-            "Desarrollador Senior", "Analista de Sistemas", "Gerente de Proyectos",
-            "Arquitecto de Software", "Especialista en DevOps", "Líder Técnico",
-            "Consultor Senior", "Ingeniero de Datos", "Product Owner",
-            "Scrum Master", "Analista de Negocio", "Coordinador de TI",
-            "Especialista en Seguridad", "Administrador de Sistemas", "QA Engineer"
-        ]
-        
-        # Sample photo URLs for testing
-        photo_urls = [
-            "https://iaap.org/wp-content/uploads/2022/11/Image_001-8.jpg",
-            "https://images.unsplash.com/photo-1560250097-0b93528c311a?w=400",
-            "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=400",
-            "https://images.unsplash.com/photo-1494790108755-2616b2e9b863?w=400",
-            "https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?w=400",
-            None,  # Some records without photos
-            None,
-            "https://images.unsplash.com/photo-1519085360753-af0119f7cbe7?w=400"
-        ]
-        
-        test_data = []
-        base_time = datetime.now()
-        
-        for i in range(count):
-            # Generate random time within the last hour
-            random_minutes = random.randint(0, 60)
-            attendance_time = base_time - timedelta(minutes=random_minutes)
-            
-            record = {
-                "nombre": random.choice(nombres),
-                "empresa": random.choice(empresas),
-                "cargo": random.choice(cargos),
-                "fecha_hora": attendance_time.strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            # Add photo to some records (60% chance)
-            if random.random() < 0.6:
-                photo_url = random.choice([url for url in photo_urls if url is not None])
-                record["photo"] = photo_url
-            
-            test_data.append(record)
-            
-        return test_data
+        return generate_attendance_records(count)
     
     def test_health_endpoint(self) -> bool:
         """
@@ -125,10 +192,10 @@ class AttendanceWebhookTester:
         """
         try:
             print("🔍 Testing health endpoint...")
-            response = requests.get(self.health_url, timeout=10)
+            response = self.session.get(self.health_url, timeout=10)
             
             if response.status_code == 200:
-                health_data = response.json()
+                health_data = orjson.loads(response.content)
                 print(f"✅ Health check passed: {health_data.get('status', 'Unknown')}")
                 return True
             else:
@@ -150,25 +217,26 @@ class AttendanceWebhookTester:
             attendance_data: Attendance record to send
             
         Returns:
-            Response data from the webhook
+            Result with status_code, success and the raw response body;
+            read the decoded body through response_data()
+            
+        WHY: Most runs only look at the status code, so the body is kept
+        raw and only decoded when it is printed or recorded
         """
         try:
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': 'AttendanceWebhookTester/1.0'
-            }
-            
-            response = requests.post(
+            # WHY: Body pre-encoded with orjson; the session already sends
+            # the JSON content type
+            response = self.session.post(
                 self.webhook_url,
-                json=attendance_data,
-                headers=headers,
+                data=orjson.dumps(attendance_data),
                 timeout=30
             )
             
             return {
                 'status_code': response.status_code,
-                'response_data': response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text,
-                'success': response.status_code == 200
+                'success': response.status_code in (200, 202),  # 202: queued for delivery
+                '_raw': response.content,
+                '_ctype': response.headers.get('content-type', '')
             }
             
         except requests.exceptions.Timeout:
@@ -184,70 +252,306 @@ class AttendanceWebhookTester:
                 'success': False
             }
     
-    def run_test_suite(self, count: int = 5, delay: float = 2.0) -> Dict[str, Any]:
+    def run_test_suite(
+        self,
+        count: int = 5,
+        delay: float = 2.0,
+        concurrency: int = 1,
+        results_file: Optional[str] = None,
+        rate: Optional[float] = None,
+        verbose: bool = False
+    ) -> Dict[str, Any]:
         """
         Run complete test suite with multiple attendance notifications.
         
         Args:
             count: Number of notifications to send
             delay: Delay between notifications in seconds
+            concurrency: Requests kept in flight at once; above 1 the
+                        notifications are sent by run_test_suite_async
+            results_file: Optional JSONL file receiving one line per request
+            rate: Optional target requests per second; replaces delay
+            verbose: Print every request instead of a one-line progress counter
             
         Returns:
-            Test results summary
+            Test results summary (aggregates only)
+            
+        WHY: Per-request records are streamed to the results file instead
+        of being kept in memory, so long runs stay O(1) in memory
+        """
+        results_fh = open(results_file, 'wb') if results_file else None
+        try:
+            if concurrency > 1:
+                return asyncio.run(self.run_test_suite_async(count, concurrency, results_fh, rate, verbose))
+            return self._run_serial(count, delay, results_fh, rate, verbose)
+        finally:
+            if results_fh is not None:
+                results_fh.close()
+    
+    def _run_serial(
+        self,
+        count: int,
+        delay: float,
+        results_fh: Optional[BinaryIO],
+        rate: Optional[float] = None,
+        verbose: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Send the notifications one after another.
+        
+        WHY: With a rate, each request starts one period after the previous
+        one started, so request latency does not lower the offered load;
+        without one, `delay` seconds are slept after each request
         """
+        period = 1.0 / rate if rate else None
+        
         print(f"\n🚀 Starting Attendance Webhook Test Suite")
         print(f"📍 Target URL: {self.webhook_url}")
         print(f"📊 Test count: {count}")
-        print(f"⏱️ Delay between tests: {delay}s")
+        if period is not None:
+            print(f"⏱️ Target rate: {rate} req/s")
+        else:
+            print(f"⏱️ Delay between tests: {delay}s")
         print("-" * 60)
         
         # Check service health first
         if not self.test_health_endpoint():
             return {
                 'success': False,
-                'error': 'Service health check failed',
-                'results': []
+                'error': 'Service health check failed'
             }
         
         # Generate test data
         test_data = self.generate_test_data(count)
-        results = []
+        latencies = deque(maxlen=_LATENCY_SAMPLES)
         successful_tests = 0
         
         # Send notifications
         for i, attendance_record in enumerate(test_data, 1):
-            has_photo = 'photo' in attendance_record
-            photo_indicator = " 📸" if has_photo else ""
+            started = time.perf_counter()
+            result = self.send_attendance_notification(attendance_record)
+            self._record_result(results_fh, latencies, i, attendance_record, result, time.perf_counter() - started)
+            successful_tests += result['success']
+            self._report_progress(i, count, successful_tests, attendance_record, result, verbose)
             
-            print(f"\n📨 Test {i}/{count}: Sending notification for {attendance_record['nombre']}{photo_indicator}")
-            print(f"   Company: {attendance_record['empresa']}")
-            print(f"   Position: {attendance_record['cargo']}")
-            print(f"   Time: {attendance_record['fecha_hora']}")
-            if has_photo:
-                print(f"   Photo: {attendance_record['photo']}")
+            # Pace requests (except after the last one)
+            if i < count and period is not None:
+                time.sleep(max(0.0, period - (time.perf_counter() - started)))
+            elif i < count and delay > 0:
+                time.sleep(delay)
+        
+        return self._summarize(count, successful_tests, latencies)
+    
+    async def run_test_suite_async(
+        self,
+        count: int = 5,
+        concurrency: int = 32,
+        results_fh: Optional[BinaryIO] = None,
+        rate: Optional[float] = None,
+        verbose: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run the test suite with up to `concurrency` requests in flight.
+        
+        Args:
+            count: Number of notifications to send
+            concurrency: Maximum simultaneous requests
+            results_fh: Optional open JSONL file receiving one line per request
+            rate: Optional target requests per second across all tasks
+            verbose: Print every request instead of a one-line progress counter
             
-            result = self.send_attendance_notification(attendance_record)
-            results.append({
-                'test_number': i,
-                'attendance_data': attendance_record,
-                'result': result
-            })
+        Returns:
+            Test results summary
             
-            if result['success']:
-                print(f"   ✅ Success: {result['response_data'].get('message', 'Notification sent')}")
-                successful_tests += 1
-            else:
-                print(f"   ❌ Failed: Status {result['status_code']}")
-                if isinstance(result['response_data'], dict):
-                    error_msg = result['response_data'].get('message', result['response_data'].get('error', 'Unknown error'))
-                    print(f"      Error: {error_msg}")
+        WHY: The serial loop measures round trips, not the server; one
+        aiohttp session keeps a pool of keep-alive connections while the
+        semaphore bounds the offered concurrency. With a rate, request i is
+        scheduled at i periods after the start, so slow responses do not
+        lower the offered load
+        """
+        print(f"\n🚀 Starting Attendance Webhook Test Suite (async)")
+        print(f"📍 Target URL: {self.webhook_url}")
+        print(f"📊 Test count: {count}")
+        print(f"🔀 Concurrency: {concurrency}")
+        if rate:
+            print(f"⏱️ Target rate: {rate} req/s")
+        print("-" * 60)
+        
+        # Check service health first (single blocking call before the burst)
+        if not self.test_health_endpoint():
+            return {
+                'success': False,
+                'error': 'Service health check failed'
+            }
+        
+        test_data = self.generate_test_data(count)
+        latencies = deque(maxlen=_LATENCY_SAMPLES)
+        successful_tests = 0
+        completed = 0
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=30)
+        headers = {'Content-Type': 'application/json', 'User-Agent': 'AttendanceWebhookTester/1.0'}
+        
+        period = 1.0 / rate if rate else 0.0
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            loop = asyncio.get_running_loop()
+            scheduled_start = loop.time()
             
-            # Delay between requests (except for the last one)
-            if i < count and delay > 0:
-                print(f"   ⏳ Waiting {delay}s before next test...")
-                time.sleep(delay)
+            async def _one(test_number: int, attendance_record: Dict[str, str]) -> None:
+                nonlocal successful_tests, completed
+                if period:
+                    await asyncio.sleep(max(0.0, scheduled_start + (test_number - 1) * period - loop.time()))
+                async with semaphore:
+                    started = time.perf_counter()
+                    result = await self._send_attendance_notification_async(session, attendance_record)
+                    latency = time.perf_counter() - started
+                
+                self._record_result(results_fh, latencies, test_number, attendance_record, result, latency)
+                successful_tests += result['success']
+                completed += 1
+                self._report_progress(completed, count, successful_tests, attendance_record, result, verbose)
+            
+            await asyncio.gather(*[
+                _one(i, attendance_record) for i, attendance_record in enumerate(test_data, 1)
+            ])
+        
+        return self._summarize(count, successful_tests, latencies)
+    
+    async def _send_attendance_notification_async(
+        self,
+        session: aiohttp.ClientSession,
+        attendance_data: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Send a single attendance notification through an aiohttp session.
+        
+        Returns:
+            Response data in the same shape as send_attendance_notification
+        """
+        try:
+            async with session.post(self.webhook_url, data=orjson.dumps(attendance_data)) as response:
+                return {
+                    'status_code': response.status,
+                    'success': response.status in (200, 202),  # 202: queued for delivery
+                    '_raw': await response.read(),
+                    '_ctype': response.headers.get('content-type', '')
+                }
+                
+        except asyncio.TimeoutError:
+            return {
+                'status_code': 0,
+                'response_data': {'error': 'Request timeout'},
+                'success': False
+            }
+        except Exception as e:
+            return {
+                'status_code': 0,
+                'response_data': {'error': str(e)},
+                'success': False
+            }
+    
+    def _report_progress(
+        self,
+        done: int,
+        count: int,
+        successful_tests: int,
+        attendance_record: Dict[str, str],
+        result: Dict[str, Any],
+        verbose: bool
+    ) -> None:
+        """
+        Report one finished request.
+        
+        WHY: Each print() is its own write to the (line-buffered) terminal;
+        by default a single carriage-return counter line is rewritten, and
+        verbose output is built into one string and printed once
+        """
+        if not verbose:
+            sys.stdout.write(f"\r[{done}/{count}] ok={successful_tests} fail={done - successful_tests}")
+            sys.stdout.flush()
+            return
+        
+        photo = attendance_record.get('photo')
+        lines = [
+            f"\n📨 Test {done}/{count}: Sending notification for {attendance_record['nombre']}{' 📸' if photo else ''}",
+            f"   Company: {attendance_record['empresa']}",
+            f"   Position: {attendance_record['cargo']}",
+            f"   Time: {attendance_record['fecha_hora']}"
+        ]
+        if photo:
+            lines.append(f"   Photo: {photo}")
+        
+        response_data = self.response_data(result)
+        if result['success']:
+            message = response_data.get('message', 'Notification sent') if isinstance(response_data, dict) else 'Notification sent'
+            lines.append(f"   ✅ Success: {message}")
+        else:
+            lines.append(f"   ❌ Failed: Status {result['status_code']}")
+            if isinstance(response_data, dict):
+                lines.append(f"      Error: {response_data.get('message', response_data.get('error', 'Unknown error'))}")
+        print("\n".join(lines))
+    
+    def response_data(self, result: Dict[str, Any]) -> Any:
+        """
+        Decode a result's response body on first access.
+        
+        Args:
+            result: Result returned by send_attendance_notification
+            
+        Returns:
+            Parsed JSON body, response text, or the client-side error dict
+        """
+        if 'response_data' not in result:
+            raw = result['_raw']
+            if result['_ctype'].startswith('application/json'):
+                try:
+                    result['response_data'] = orjson.loads(raw)
+                except ValueError:
+                    result['response_data'] = raw.decode('utf-8', errors='replace')
+            else:
+                result['response_data'] = raw.decode('utf-8', errors='replace')
+        return result['response_data']
+    
+    def _record_result(
+        self,
+        results_fh: Optional[BinaryIO],
+        latencies: deque,
+        test_number: int,
+        attendance_record: Dict[str, str],
+        result: Dict[str, Any],
+        latency: float
+    ) -> None:
+        """Keep the latency sample and append the request record to the results file."""
+        latencies.append(latency)
+        if results_fh is not None:
+            results_fh.write(orjson.dumps({
+                'test_number': test_number,
+                'attendance_data': attendance_record,
+                'result': {
+                    'status_code': result['status_code'],
+                    'success': result['success'],
+                    'response_data': self.response_data(result)
+                },
+                'latency_ms': round(latency * 1000, 2)
+            }) + b'\n')
+    
+    def _summarize(self, count: int, successful_tests: int, latencies: deque) -> Dict[str, Any]:
+        """Print the results summary and build the suite result."""
+        # WHY: Percentiles come from the bounded sample, not every request
+        latency_ms = {}
+        if len(latencies) >= 2:
+            cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+            latency_ms = {
+                'p50': round(cuts[49] * 1000, 2),
+                'p95': round(cuts[94] * 1000, 2),
+                'p99': round(cuts[98] * 1000, 2)
+            }
+        elif latencies:
+            single = round(latencies[0] * 1000, 2)
+            latency_ms = {'p50': single, 'p95': single, 'p99': single}
         
-        # Summary
         print("\n" + "=" * 60)
         print("📈 TEST RESULTS SUMMARY")
         print("=" * 60)
@@ -255,6 +559,8 @@ class AttendanceWebhookTester:
         print(f"Successful: {successful_tests}")
         print(f"Failed: {count - successful_tests}")
         print(f"Success rate: {(successful_tests/count*100):.1f}%")
+        if latency_ms:
+            print(f"Latency p50/p95/p99: {latency_ms['p50']}/{latency_ms['p95']}/{latency_ms['p99']} ms")
         
         if successful_tests == count:
             print("🎉 All tests passed successfully!")
@@ -269,7 +575,7 @@ class AttendanceWebhookTester:
             'successful_tests': successful_tests,
             'failed_tests': count - successful_tests,
             'success_rate': successful_tests / count * 100,
-            'results': results
+            'latency_ms': latency_ms
         }
     
     def test_invalid_data(self) -> None:
@@ -343,20 +649,18 @@ class AttendanceWebhookTester:
         for test_case in invalid_test_cases:
             print(f"\n   Testing: {test_case['name']}")
             try:
-                headers = {'Content-Type': 'application/json'}
-                response = requests.post(
+                response = self.session.post(
                     self.webhook_url,
-                    json=test_case['data'],
-                    headers=headers,
+                    data=orjson.dumps(test_case['data']),
                     timeout=10
                 )
                 
                 if test_case['name'] == 'Valid data with photo':
                     # This should succeed (200) or fail gracefully (400-500)
-                    if response.status_code == 200:
+                    if response.status_code in (200, 202):
                         print(f"   ✅ Successfully sent with photo: {response.status_code}")
                         try:
-                            success_data = response.json()
+                            success_data = orjson.loads(response.content)
                             print(f"      Response: {success_data.get('message', 'N/A')}")
                         except:
                             pass
@@ -369,7 +673,7 @@ class AttendanceWebhookTester:
                     if 400 <= response.status_code < 500:
                         print(f"   ✅ Correctly rejected with status {response.status_code}")
                         try:
-                            error_data = response.json()
+                            error_data = orjson.loads(response.content)
                             print(f"      Error message: {error_data.get('message', 'N/A')}")
                         except:
                             pass
@@ -387,7 +691,13 @@ def main():
     parser.add_argument('--port', type=int, default=5000, help='Flask app port')
     parser.add_argument('--count', type=int, default=5, help='Number of test notifications')
     parser.add_argument('--delay', type=float, default=2.0, help='Delay between tests (seconds)')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Requests in flight at once (above 1 sends concurrently, ignoring --delay)')
+    parser.add_argument('--rate', type=float, help='Target requests per second (replaces --delay)')
+    parser.add_argument('--results-file', help='Write one JSON line per request to this file')
     parser.add_argument('--test-errors', action='store_true', help='Also test error handling')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Print every request instead of a one-line progress counter')
     
     args = parser.parse_args()
     
@@ -395,11 +705,13 @@ def main():
     base_url = f"http://{args.host}:{args.port}"
     
     # Create tester instance
-    tester = AttendanceWebhookTester(base_url)
+    tester = AttendanceWebhookTester(base_url, args.concurrency)
     
     try:
         # Run main test suite
-        results = tester.run_test_suite(args.count, args.delay)
+        results = tester.run_test_suite(
+            args.count, args.delay, args.concurrency, args.results_file, args.rate, args.verbose
+        )
         
         # Test error handling if requested
         if args.test_errors:
@@ -414,6 +726,8 @@ def main():
     except Exception as e:
         print(f"\n🚨 Test suite error: {e}")
         sys.exit(1)
+    finally:
+        tester.close()
 
 
 if __name__ == '__main__':
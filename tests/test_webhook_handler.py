@@ -0,0 +1,53 @@
+"""
+Tests for webhook body decoding and its hand-off to validation.
+"""
+
+import orjson
+import pytest
+
+import services.whatsapp_service as whatsapp_service_module
+from config import TestingConfig
+from handlers.webhook_handler import AttendanceWebhookHandler
+from services.whatsapp_service import WhatsAppService
+
+_ATTENDANCE = {
+    'nombre': 'Ana Torres',
+    'empresa': 'Kossodo',
+    'cargo': 'Gerente',
+    'fecha_hora': '2024-01-15 10:30:00'
+}
+
+
+@pytest.fixture
+def handler():
+    service = WhatsAppService(TestingConfig.get_whatsapp_config())
+    yield AttendanceWebhookHandler(service)
+    service._executor.shutdown(wait=False)
+
+
+def test_decoded_payload_is_not_converted_again(handler, monkeypatch):
+    attendance_data, payload = handler._decode_attendance_payload(orjson.dumps(_ATTENDANCE))
+    assert payload is not None
+    
+    def _fail(*args, **kwargs):
+        raise AssertionError("msgspec.convert called for a decoded payload")
+    monkeypatch.setattr(whatsapp_service_module.msgspec, 'convert', _fail)
+    
+    assert handler.whatsapp_service.validate_attendance_data(attendance_data, payload) == (True, "Valid")
+
+
+def test_schema_rejected_body_falls_back_to_detailed_errors(handler):
+    body = orjson.dumps({**_ATTENDANCE, 'nombre': ''})
+    attendance_data, payload = handler._decode_attendance_payload(body)
+    assert payload is None
+    
+    is_valid, message = handler.whatsapp_service.validate_attendance_data(attendance_data, payload)
+    assert not is_valid
+    assert message == "Empty required fields: nombre"
+
+
+def test_extra_fields_are_passed_through(handler):
+    body = orjson.dumps({**_ATTENDANCE, 'evento': 'Expo 2024', 'stand': 12})
+    attendance_data, payload = handler._decode_attendance_payload(body)
+    assert attendance_data == {**_ATTENDANCE, 'evento': 'Expo 2024', 'stand': 12}
+    assert handler.whatsapp_service.validate_attendance_data(attendance_data, payload) == (True, "Valid")
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Tests for attendance data validation in the WhatsApp service.
+"""
+
+import logging
+import time
+
+import pytest
+
+import services.whatsapp_service as whatsapp_service_module
+from config import TestingConfig
+from services.whatsapp_service import WhatsAppService
+
+_ATTENDANCE = {
+    'nombre': 'Ana Torres',
+    'empresa': 'Kossodo',
+    'cargo': 'Gerente',
+    'fecha_hora': '2024-01-15 10:30:00'
+}
+
+
+@pytest.fixture
+def service():
+    service = WhatsAppService(TestingConfig.get_whatsapp_config())
+    yield service
+    service._executor.shutdown(wait=False)
+
+
+@pytest.mark.parametrize('photo, expected', [
+    ('http://' + ' ' * 60000 + 'x', (False, "Photo URL exceeds maximum length of 2000 characters")),
+    (' ' * 30000 + 'https://example.com/a.PNG' + '\t' * 30000, (True, "Valid")),
+    (' ' * 60000 + 'ftp://example.com/a.png', (False, "Photo field must be a valid URL starting with http:// or https://")),
+    ('https://example.com/' + 'a' * 2000, (False, "Photo URL exceeds maximum length of 2000 characters")),
+], ids=['inner-padding', 'outer-padding', 'padded-bad-scheme', 'too-long'])
+def test_whitespace_padded_photo_url_validates_in_linear_time(service, photo, expected):
+    started = time.perf_counter()
+    assert service.validate_attendance_data({**_ATTENDANCE, 'photo': photo}) == expected
+    assert time.perf_counter() - started < 0.5
+
+
+@pytest.mark.parametrize('fecha_hora, valid', [
+    ('2024-01-15 10:30:00', True),
+    ('2024-01-15  10:30:00', True),
+    ('2024-01-15\t10:30:00', True),
+    ('2024-1-5 1:3:0', True),
+    ('12/01/2024 10:30', True),
+    (' 5/01/2024 10:30', True),
+    ('１２/01/2024 10:30', False),
+    ('2024-01-15 10:30:00 ', False),
+    ('2024-02-30 10:30:00', False),
+    ('2024-01-15 24:00:00', False),
+])
+def test_fecha_hora_formats_match_strptime(service, fecha_hora, valid):
+    is_valid, _ = service.validate_attendance_data({**_ATTENDANCE, 'fecha_hora': fecha_hora})
+    assert is_valid is valid
+
+
+def test_client_is_built_outside_in_flight_slot_and_keeps_logging(monkeypatch):
+    config = TestingConfig.get_whatsapp_config()
+    config.update(api_version=None, max_in_flight=1)
+    service = WhatsAppService(config)
+    slots_free = []
+    
+    class _FakeWhatsApp:
+        LATEST = 'v18.0'
+        url = 'https://graph.facebook.com/v18.0/test_phone_id/messages'
+        
+        def __init__(self, **kwargs):
+            # WHY: Mimics whatsapp-python with debug=False
+            slots_free.append(service._in_flight.acquire(blocking=False))
+            if slots_free[-1]:
+                service._in_flight.release()
+            logging.disable(logging.ERROR)
+    
+    class _FakeResponse:
+        status_code = 200
+    
+    monkeypatch.setattr(whatsapp_service_module, 'WhatsApp', _FakeWhatsApp)
+    monkeypatch.setattr(service._http, 'post', lambda url, **kwargs: _FakeResponse())
+    try:
+        disabled_level = logging.root.manager.disable
+        assert service._post_with_retry('+1234567890', {'type': 'text'}).status_code == 200
+        assert slots_free == [True]
+        assert logging.root.manager.disable == disabled_level
+        assert service._messages_url == _FakeWhatsApp.url
+    finally:
+        service._executor.shutdown(wait=False)
\ No newline at end of file
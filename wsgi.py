@@ -4,41 +4,30 @@ WSGI entry point for gunicorn deployment.
 This module provides the WSGI application object that gunicorn expects.
 It creates a properly configured Flask application without interfering
 with the main application entry point.
+
+WHY: Run gunicorn with --preload (see Procfile), e.g.
+    gunicorn --preload --worker-class gthread -w N wsgi:application
+so the app is built once in the master and shared copy-on-write by the
+forked workers; the log listener and notification workers restart
+themselves in each child. The app is warmed up before serving (see
+warm_up_app; disable with WARMUP_ON_START=False).
 """
 
 import os
-from app import create_app, get_config, setup_logging, setup_rate_limiting
-from app import setup_error_handlers, setup_request_logging, initialize_services
-from handlers.webhook_handler import create_webhook_routes
+from functools import lru_cache
+
+from app import build_app, warm_up_app
+
+# Environment resolved once at import
+_ENVIRONMENT = os.environ.get('FLASK_ENV', 'development')
 
 
+@lru_cache(maxsize=1)
 def create_wsgi_app():
-    """Create Flask application for WSGI deployment."""
-    environment = os.environ.get('FLASK_ENV', 'development')
-    
-    # Create and configure Flask app
-    flask_app = create_app(environment)
-    config = get_config(environment)
-    
-    # Setup logging
-    setup_logging(flask_app, config)
-    
-    # Setup rate limiting
-    limiter = setup_rate_limiting(flask_app, config)
-    
-    # Setup error handlers
-    setup_error_handlers(flask_app)
-    
-    # Setup request logging
-    setup_request_logging(flask_app)
-    
-    # Initialize services
-    whatsapp_service, webhook_handler = initialize_services(flask_app, config)
-    
-    # Create webhook routes
-    create_webhook_routes(flask_app, webhook_handler, config.WHATSAPP_VERIFY_TOKEN)
-    
-    return flask_app
+    """Create Flask application for WSGI deployment (built once per process)."""
+    application = build_app(_ENVIRONMENT)
+    warm_up_app(application)
+    return application
 
 
 # Create the WSGI application